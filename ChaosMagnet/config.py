@@ -5,7 +5,10 @@ import os
 # --- System Settings ---
 POOL_SIZE = 1024          # Bytes in the entropy pool
 HISTORY_LEN = 300         # How many data points to keep for the GUI graph
+METRICS_INTERVAL = 0.1    # Min seconds between metric snapshots (GUI graph tick)
 KEYS_DIR = "keys"         # Where to save the audit trail
+WORKER_BATCH = 8          # Max queued samples mixed per SHA-3 chain
+NET_BATCH = 64            # Max packets per uplink POST to Ayatoki
 
 # Create keys directory if missing
 if not os.path.exists(KEYS_DIR):
@@ -23,6 +26,8 @@ RATE_VIDEO  = 1.0         # Slow poll to save CPU/Battery
 RCT_CUTOFF = 10
 # If one byte value appears more than this % of the time in a sample, fail.
 APT_CUTOFF = 0.40 
+# Already-conditioned sources (kernel/hardware RNG) that bypass RCT/APT.
+AUDIT_EXEMPT_SOURCES = {"TRNG"}
 
 # --- Theme: Cobra Lab Stealth ---
 COLOR_BG         = (15, 15, 20, 255)
@@ -6,9 +6,13 @@ import time
 import json
 import os
 import queue  # Standard Python thread-safe queue
+import socket
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from config import POOL_SIZE, HISTORY_LEN, KEYS_DIR, RCT_CUTOFF, APT_CUTOFF
-from utils import calculate_shannon_entropy, HealthMonitor, get_timestamp
+from requests.adapters import HTTPAdapter
+import numpy as np
+from config import POOL_SIZE, HISTORY_LEN, KEYS_DIR, RCT_CUTOFF, APT_CUTOFF, AUDIT_EXEMPT_SOURCES, WORKER_BATCH, NET_BATCH, METRICS_INTERVAL
+from utils import entropy_from_histogram, HealthMonitor, RingBuffer, get_timestamp, pack_frame
 
 # --- RUST BINDINGS ---
 try:
@@ -19,40 +23,83 @@ except ImportError:
     HAS_PQC = False
     print(" [!] PQC CORE: Bindings missing. Falling back to standard crypto.")
 
+# --- OPTIONAL FAST JSON (Vault writes) ---
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+class TunedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter with Nagle off and TCP keep-alive on.
+    Small uplink packets otherwise stall on Nagle + delayed-ACK.
+    """
+    SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
 class ChaosEngine:
     def __init__(self):
         # The Crypto State (Actual Mixing Pool - Always 32 bytes/256 bits)
         self.pool = b'\x00' * 32
         
         # The Display Pool (Rolling buffer for Entropy Graph & Math)
-        self.display_pool = collections.deque(maxlen=POOL_SIZE)
-        self.display_pool.extend([0] * POOL_SIZE)
+        # PERF: Fixed ring + running 256-bin histogram. Each write only
+        # touches the evicted/new bytes, so Shannon never rescans the pool.
+        self.display_buf = np.zeros(POOL_SIZE, dtype=np.uint8)
+        self.display_pos = 0
+        self.hist = np.zeros(256, dtype=np.int32)
+        self.hist[0] = POOL_SIZE
 
         self.lock = threading.Lock()
         
         # Phase 3: Networking & Autonomy
         # MITSU CONFIG: Target is Ayatoki (Fedora) at .19
-        self.ayatoki_url = "http://192.168.1.19:8000/ingest" 
+        # Binary framed endpoint; takes one or more concatenated frames per POST
+        self.ayatoki_url = "http://192.168.1.19:8000/ingest_bin" 
         self.network_mode = True 
         self.sequence_id = 0
         
         # STABILITY FIX 1: Persistent Session
         # Reuses TCP connection to Ayatoki (Keep-Alive) to prevent socket exhaustion
         self.session = requests.Session()
+        # PERF: One host, one uploader thread -> tiny pool, no retries, no Nagle
+        self.session.mount("http://", TunedAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+        self.session.headers["Connection"] = "keep-alive"
 
         # --- STABILITY ARCHITECTURE: The Producer-Consumer Queue ---
         # Harvesters dump data here instantly. The worker processes it safely.
-        self.input_queue = queue.Queue(maxsize=1000)
+        # PERF: Ring buffer instead of queue.Queue (no Condition handshake per item)
+        self.input_queue = RingBuffer(1024)
         
         # STABILITY FIX 2: Dedicated Network Queue
         # Decouples entropy processing from network latency.
         # Maxsize=100 ensures we don't eat RAM if the network dies.
         self.net_queue = queue.Queue(maxsize=100)
+
+        # Vault writer: keeps disk latency off the minting path
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vault")
         
         # Metrics
         self.total_harvested = 0
-        self.history_entropy = collections.deque([0.0]*HISTORY_LEN, maxlen=HISTORY_LEN)
+        # PERF: Preallocated plot ring + fixed x-axis; handed to DearPyGui as arrays
+        self.history_buf = np.zeros(HISTORY_LEN, dtype=np.float64)
+        self.history_x = np.arange(HISTORY_LEN, dtype=np.float64)
+        self.history_pos = 0
         self.log_buffer = collections.deque(maxlen=20)
+        # Encoded harvester names for pool mixing (fixed, small set)
+        self._name_cache = {}
+        # Shannon cache for get_metrics, keyed by total_harvested
+        self._entropy_cache = (-1, 0.0)
+        # Whole-snapshot cache so a 60 FPS GUI only takes the lock at ~10 Hz
+        self._metrics_cache = None
+        self._metrics_ts = 0.0
         
         # PQC Identity (Session Key)
         self.falcon_pk = None
@@ -91,10 +138,8 @@ class ChaosEngine:
         NON-BLOCKING ENTRY POINT.
         Harvesters call this. It returns INSTANTLY.
         """
-        try:
-            self.input_queue.put_nowait((source_name, data))
-        except queue.Full:
-            pass
+        # Full ring drops the sample, same as before
+        self.input_queue.put_nowait((source_name, data))
 
     def _worker_loop(self):
         """
@@ -104,71 +149,97 @@ class ChaosEngine:
         last_net_queue_time = 0.0
         
         while self.running:
-            try:
-                # Wait up to 1s for data
-                source_name, data = self.input_queue.get(timeout=1.0)
-            except queue.Empty:
+            item = self.input_queue.get_nowait()
+            if item is None:
+                # Idle: back off briefly instead of spinning
+                time.sleep(0.005)
                 continue
+            batch = [item]
 
-            # --- 1. AUDIT (Local NIST Check) ---
-            passed_rct, _ = HealthMonitor.repetition_count_test(data, RCT_CUTOFF)
-            if not passed_rct: 
-                self.input_queue.task_done()
-                continue
-                
-            passed_apt, _ = HealthMonitor.adaptive_proportion_test(data, APT_CUTOFF)
-            if not passed_apt: 
-                self.input_queue.task_done()
-                continue
+            # PERF: Drain whatever is already waiting so the pool mix below
+            # runs as one SHA-3 chain instead of one per sample.
+            while len(batch) < WORKER_BATCH:
+                item = self.input_queue.get_nowait()
+                if item is None:
+                    break
+                batch.append(item)
+
+            accepted = []
+            for source_name, data in batch:
+                # --- 1. AUDIT (Local NIST Check) ---
+                # Conditioned sources (hwrng/urandom) skip it: 32 bytes is too
+                # small a sample for RCT/APT to say anything anyway.
+                if source_name in AUDIT_EXEMPT_SOURCES:
+                    counts = None
+                else:
+                    # PERF: RCT + APT share one uint8 view and one bincount
+                    passed, counts = HealthMonitor.check(data, RCT_CUTOFF, APT_CUTOFF)
+                    if not passed:
+                        continue
 
-            # --- 2. WHITEN (SHA-3 Compression) ---
-            whitened_data = hashlib.sha3_256(data).digest()
-            self.sequence_id += 1
+                # --- 2. WHITEN (SHA-3 Compression) ---
+                accepted.append((source_name, hashlib.sha3_256(data).digest(), data, counts))
+
+            if not accepted:
+                continue
 
             # --- 3. UPDATE LOCAL STATE ---
             with self.lock:
                 # Mix into Crypto State
                 hasher = hashlib.sha3_256()
                 hasher.update(self.pool)
-                hasher.update(source_name.encode())
-                hasher.update(whitened_data)
+                for source_name, whitened_data, *_ in accepted:
+                    name_bytes = self._name_cache.get(source_name)
+                    if name_bytes is None:
+                        name_bytes = self._name_cache.setdefault(source_name, source_name.encode())
+                    hasher.update(name_bytes)
+                    hasher.update(whitened_data)
+
+                    # Update GUI Graph Buffer
+                    self._push_display(whitened_data)
                 self.pool = hasher.digest()
+
+                prev_total, prev_seq = self.total_harvested, self.sequence_id
+                self.total_harvested += 32 * len(accepted)
+                self.sequence_id += len(accepted)
+
+                # Batches advance the counters in steps, so test for crossing
+                # a boundary rather than landing exactly on it.
+                snapshot_hist = None
+                if prev_total // 320 != self.total_harvested // 320:
+                    snapshot_hist = self.hist.copy()
+
+            # --- AUTONOMOUS MINTING LOGIC ---
+            # PERF: Runs on a histogram snapshot outside the lock, so the GUI's
+            # get_metrics() never waits on the quality math, logging or minting.
+            # (get_pqc_bundle takes the lock itself.)
+            if snapshot_hist is not None:
+                pool_quality = entropy_from_histogram(snapshot_hist, POOL_SIZE)
                 
-                # Update GUI Graph Buffer
-                self.display_pool.extend(whitened_data)
-                self.total_harvested += len(whitened_data)
-
-                # --- AUTONOMOUS MINTING LOGIC ---
-                if self.total_harvested % 320 == 0:
-                    pool_quality = calculate_shannon_entropy(bytes(self.display_pool))
-                    
-                    if self.sequence_id % 50 == 0:
-                        self.log(f"LOCAL [{source_name}] Pool Qual: {pool_quality:.2f}")
-                    
-                    if pool_quality > 7.5 and self.pqc_active:
-                        if self.sequence_id % 500 == 0:
-                            self.log("AUTONOMOUS: High quality pool. Minting PQC Bundle...")
-                            self.get_pqc_bundle(requester="MITSU_AUTO")
+                if prev_seq // 50 != self.sequence_id // 50:
+                    self.log(f"LOCAL [{source_name}] Pool Qual: {pool_quality:.2f}")
+                
+                if pool_quality > 7.5 and self.pqc_active:
+                    if prev_seq // 500 != self.sequence_id // 500:
+                        self.log("AUTONOMOUS: High quality pool. Minting PQC Bundle...")
+                        self.get_pqc_bundle(requester="MITSU_AUTO")
 
             # --- 4. PREPARE NETWORK PACKET (Non-Blocking) ---
             # Instead of sending here, we just build the packet and push to the Net Queue.
+            # Only the newest sample in the batch is reported.
+            source_name, whitened_data, data, counts = accepted[-1]
             now = time.time()
             if self.network_mode and (now - last_net_queue_time > 0.1): 
                 last_net_queue_time = now
                 
-                chunk_entropy = calculate_shannon_entropy(whitened_data)
-                packet = {
-                    "node": "mitsu_chaos_magnet",
-                    "seq": self.sequence_id,
-                    "timestamp": get_timestamp(),
-                    "ts_epoch": now,
-                    "entropy_estimate": chunk_entropy,
-                    "health": "OK",
-                    "source": source_name,
-                    "metrics": {"size": len(whitened_data)},
-                    "payload_hex": whitened_data.hex(),
-                    "digest": hashlib.sha3_256(data).hexdigest()
-                }
+                # Estimate on the raw sample: a 32-byte digest always reads ~5 bits.
+                # The audit already produced its histogram, so this is nearly free.
+                # Unaudited (exempt) sources report 0.0 = not estimated.
+                chunk_entropy = entropy_from_histogram(counts, len(data)) if counts is not None else 0.0
+                # PERF: Binary frame instead of JSON + hex. The payload IS the
+                # SHA3 digest of the sample, so no separate digest field.
+                frame = pack_frame(self.sequence_id, now, chunk_entropy, source_name, whitened_data)
+                packet = (self.sequence_id, frame)
                 
                 try:
                     # GRACEFUL FALLBACK: 
@@ -178,8 +249,25 @@ class ChaosEngine:
                 except queue.Full:
                     # This pass is critical: It means "Drop packet and keep surviving"
                     pass
-            
-            self.input_queue.task_done()
+
+    def _push_display(self, chunk):
+        """Writes chunk into the display ring, keeping self.hist in sync. Caller holds self.lock."""
+        new = np.frombuffer(chunk, dtype=np.uint8)
+        if new.size >= POOL_SIZE:
+            new = new[-POOL_SIZE:]
+        pos = self.display_pos
+        end = pos + new.size
+        if end <= POOL_SIZE:
+            np.subtract.at(self.hist, self.display_buf[pos:end], 1)
+            self.display_buf[pos:end] = new
+        else:
+            split = POOL_SIZE - pos
+            np.subtract.at(self.hist, self.display_buf[pos:], 1)
+            np.subtract.at(self.hist, self.display_buf[:end - POOL_SIZE], 1)
+            self.display_buf[pos:] = new[:split]
+            self.display_buf[:end - POOL_SIZE] = new[split:]
+        np.add.at(self.hist, new, 1)
+        self.display_pos = end % POOL_SIZE
 
     def _net_worker_loop(self):
         """
@@ -189,69 +277,114 @@ class ChaosEngine:
         while self.running:
             try:
                 # Wait forever for a packet (blocking here is fine, this is a dedicated thread)
-                packet = self.net_queue.get()
+                batch = [self.net_queue.get()]
             except queue.Empty:
                 continue
 
+            # PERF: Coalesce any backlog into one POST instead of one per packet
+            try:
+                while len(batch) < NET_BATCH:
+                    batch.append(self.net_queue.get_nowait())
+            except queue.Empty:
+                pass
+
             try:
                 # Use the persistent session!
-                self.session.post(self.ayatoki_url, json=packet, timeout=0.5)
+                # Frames are self-delimiting, so a batch is just their concatenation
+                self.session.post(
+                    self.ayatoki_url,
+                    data=b"".join(frame for _, frame in batch),
+                    headers={"Content-Type": "application/octet-stream"},
+                    timeout=0.5,
+                )
                 
-                if packet['seq'] % 50 == 0:
-                    self.log(f"UPLINK: Sent Seq {packet['seq']} to Ayatoki")
+                for seq, _ in batch:
+                    if seq % 50 == 0:
+                        self.log(f"UPLINK: Sent Seq {seq} to Ayatoki")
             except Exception:
                 # If Ayatoki is down, we silently fail here. 
                 # This prevents the logs from spamming if the server is off.
                 pass
             finally:
-                self.net_queue.task_done()
+                for _ in batch:
+                    self.net_queue.task_done()
 
     def get_pqc_bundle(self, requester="LOCAL"):
         """Generates, signs, and saves PQC keys."""
         if not self.pqc_active: return None
+        kyber_pk, kyber_sk = pqc.kyber_keygen()
+        # PERF: Only the pool read needs the lock; keygen/sign run on locals
         with self.lock:
-            kyber_pk, kyber_sk = pqc.kyber_keygen()
-            context_hash = hashlib.sha3_256(self.pool + kyber_pk).digest()
-            signature = pqc.falcon_sign(self.falcon_sk, context_hash)
-            
-            timestamp = time.time()
-            bundle = {
-                "type": "COBRA_PQC_BUNDLE",
-                "requester": requester,
-                "kyber_pk": kyber_pk.hex(),
-                "kyber_sk": kyber_sk.hex(),
-                "falcon_sig": signature.hex(),
-                "falcon_signer_pk": self.falcon_pk.hex(),
-                "timestamp": timestamp,
-                "human_time": get_timestamp()
-            }
-            self._save_to_vault(bundle)
-            return bundle
+            pool = self.pool
+        context_hash = hashlib.sha3_256(pool + kyber_pk).digest()
+        signature = pqc.falcon_sign(self.falcon_sk, context_hash)
+        
+        timestamp = time.time()
+        bundle = {
+            "type": "COBRA_PQC_BUNDLE",
+            "requester": requester,
+            "kyber_pk": kyber_pk.hex(),
+            "kyber_sk": kyber_sk.hex(),
+            "falcon_sig": signature.hex(),
+            "falcon_signer_pk": self.falcon_pk.hex(),
+            "timestamp": timestamp,
+            "human_time": get_timestamp(timestamp)
+        }
+        self._save_to_vault(bundle)
+        return bundle
 
     def _save_to_vault(self, bundle):
         filename = f"key_{int(bundle['timestamp'])}_{bundle['kyber_pk'][:8]}.json"
         filepath = os.path.join(KEYS_DIR, filename)
+        if HAS_ORJSON:
+            data = orjson.dumps(bundle, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(bundle, indent=2).encode()
+        # PERF: Serialize here, hand the disk write to the vault thread
+        self._io_pool.submit(self._write_vault_file, filepath, filename, data)
+
+    def _write_vault_file(self, filepath, filename, data):
         try:
-            with open(filepath, "w") as f:
-                json.dump(bundle, f, indent=2)
+            with open(filepath, "wb") as f:
+                f.write(data)
             self.log(f"VAULT: Saved {filename}")
         except Exception as e:
             self.log(f"VAULT ERROR: {e}")
 
+    def shutdown(self):
+        """Stop the mixer and drain pending vault writes before exit."""
+        self.running = False
+        self.worker_thread.join(timeout=1.0)
+        self._io_pool.shutdown(wait=True)
+
     def log(self, message):
         ts = time.strftime("%H:%M:%S")
         self.log_buffer.append(f"[{ts}] {message}")
 
     def get_metrics(self):
+        # PERF: GUI polls every frame; serve the last snapshot between refreshes
+        now = time.monotonic()
+        if self._metrics_cache is not None and now - self._metrics_ts < METRICS_INTERVAL:
+            return self._metrics_cache
+
         with self.lock:
-            current_ent = calculate_shannon_entropy(bytes(self.display_pool))
-            self.history_entropy.append(current_ent)
-            return {
+            # PERF: Only recompute when new bytes have landed in the pool
+            if self._entropy_cache[0] != self.total_harvested:
+                self._entropy_cache = (self.total_harvested, entropy_from_histogram(self.hist, POOL_SIZE))
+            current_ent = self._entropy_cache[1]
+            self.history_buf[self.history_pos] = current_ent
+            self.history_pos = (self.history_pos + 1) % HISTORY_LEN
+            pos = self.history_pos
+            self._metrics_cache = {
                 "pool_hex": self.pool.hex().upper(),
                 "total_bytes": self.total_harvested,
                 "current_entropy": current_ent,
-                "history": list(self.history_entropy),
+                # Oldest -> newest
+                "history": np.concatenate((self.history_buf[pos:], self.history_buf[:pos])),
+                "history_x": self.history_x,
                 "logs": list(self.log_buffer),
                 "pqc_ready": self.pqc_active,
                 "net_mode": self.network_mode
-            }
\ No newline at end of file
+            }
+            self._metrics_ts = now
+            return self._metrics_cache
\ No newline at end of file
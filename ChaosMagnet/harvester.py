@@ -4,6 +4,7 @@ import time
 import psutil
 import random
 import os
+import struct
 import numpy as np
 
 # --- IMPORTS WITH SAFETY CHECKS ---
@@ -36,54 +37,90 @@ class BaseHarvester(threading.Thread):
         self.stop_event = threading.Event()
 
     def run(self):
-        while not self.stop_event.is_set():
-            if self.active and self.available:
-                try:
-                    data = self.collect()
-                    if data:
-                        self.engine.inject_entropy(self.name, data)
-                except Exception as e:
-                    print(f"[!] {self.name} Error: {e}")
-                    self.active = False
-            time.sleep(self.rate)
+        try:
+            while not self.stop_event.is_set():
+                if self.active and self.available:
+                    try:
+                        data = self.collect()
+                        if data:
+                            self.engine.inject_entropy(self.name, data)
+                    except Exception as e:
+                        print(f"[!] {self.name} Error: {e}")
+                        self.active = False
+                # Sleep on the event so stop_event.set() wakes us immediately
+                self.stop_event.wait(self.rate)
+        finally:
+            self.release()
 
     def collect(self):
         raise NotImplementedError
 
+    def release(self):
+        """Free held devices; runs on the harvester thread once it stops."""
+        pass
+
     def toggle(self, state):
         self.active = state
 
+# Raw numeric snapshots: the old repr() strings were mostly constant field labels
+SYS_STATS = struct.Struct('<ddddQQQ')   # cpu user/system/idle/iowait, mem available/used, time_ns
+DISK_STATS = struct.Struct('<QQQ')      # read_bytes, write_bytes, read_count
+
 class SystemHarvester(BaseHarvester):
     def collect(self):
         cpu = psutil.cpu_times()
         mem = psutil.virtual_memory()
         disk = psutil.disk_io_counters()
-        t = time.time_ns()
-        raw = f"{cpu}{mem}{disk}{t}"
-        return raw.encode()
+        # iowait is Linux-only
+        raw = SYS_STATS.pack(cpu.user, cpu.system, cpu.idle, getattr(cpu, 'iowait', 0.0),
+                             mem.available, mem.used, time.time_ns())
+        # No disks -> omit the block rather than pad with zeros (would trip RCT)
+        if disk is not None:
+            raw += DISK_STATS.pack(disk.read_bytes, disk.write_bytes, disk.read_count)
+        return raw
 
 class TRNGHarvester(BaseHarvester):
     """
     Harvests from Hardware/Kernel True Random Number Generators.
-    Priority: /dev/hwrng (Raw Hardware) -> /dev/random (Kernel Entropy) -> os.urandom
+    Priority: /dev/hwrng (Raw Hardware) -> getrandom() (Kernel Entropy) -> os.urandom
     """
+    def __init__(self, engine, name, rate):
+        super().__init__(engine, name, rate)
+        # PERF: Open /dev/hwrng once instead of open/close on every poll
+        self._hwrng_fd = None
+        try:
+            self._hwrng_fd = os.open("/dev/hwrng", os.O_RDONLY)
+        except OSError:
+            pass # Missing or no permission -> kernel pool
+
     def collect(self):
         try:
             # Try reading raw hardware RNG first (requires permissions)
-            if os.path.exists("/dev/hwrng"):
-                with open("/dev/hwrng", "rb") as f:
-                    return f.read(32) # 256 bits
+            if self._hwrng_fd is not None:
+                data = os.read(self._hwrng_fd, 32) # 256 bits
+                if data:
+                    return data
             
-            # Fallback to Kernel Entropy Pool
+            # Fallback to Kernel Entropy Pool (one syscall, no fd)
+            if hasattr(os, "getrandom"):
+                return os.getrandom(32, os.GRND_NONBLOCK)
             return os.urandom(32)
         except Exception:
             # Final fallback
             return os.urandom(32)
 
+    def release(self):
+        if self._hwrng_fd is not None:
+            os.close(self._hwrng_fd)
+            self._hwrng_fd = None
+
 class AudioHarvester(BaseHarvester):
     def __init__(self, engine, name, rate):
         super().__init__(engine, name, rate)
         self.device_index = None
+        # PERF: Native int16 samples, reused across polls. Mic noise lives in
+        # the LSBs; float64 padded every sample with 6 bytes of exponent/sign.
+        self._rec_buf = np.zeros((int(0.1*44100), 1), dtype=np.int16)
         if HAS_AUDIO:
             try:
                 # Simply check if the audio subsystem is responsive.
@@ -100,9 +137,9 @@ class AudioHarvester(BaseHarvester):
         try:
             # STABILITY FIX: Reduced sample duration to 0.1s (was 0.2s)
             # This makes the UI feel snappier and prevents blocking.
-            rec = sd.rec(int(0.1*44100), samplerate=44100, channels=1, device=None, dtype='float64')
+            sd.rec(samplerate=44100, channels=1, device=None, dtype='int16', out=self._rec_buf)
             sd.wait()
-            return rec.tobytes()
+            return self._rec_buf.tobytes()
         except:
             return None
 
@@ -122,9 +159,11 @@ class VideoHarvester(BaseHarvester):
                 return None
         ret, frame = self.cap.read()
         if ret:
-            noise = frame.flatten()
-            # STABILITY FIX: Downsample aggressively [::7] to save CPU
-            return noise[::7].tobytes()
+            # STABILITY FIX: Downsample aggressively to save CPU
+            # PERF: Stride the 2D frame before copying (no full-frame flatten).
+            # Keeps all 3 channels of each sampled pixel instead of the linear
+            # [::7] pattern, which cycled through channels unevenly.
+            return frame[::7, ::7].tobytes()
         return None
 
     def toggle(self, state):
@@ -133,6 +172,14 @@ class VideoHarvester(BaseHarvester):
             self.cap.release()
             self.cap = None
 
+    def release(self):
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+# x, y, time_ns -> 16 raw bytes (no decimal formatting)
+MOUSE_MOVE = struct.Struct('<iiQ')
+
 class MouseHarvester:
     def __init__(self, engine):
         self.engine = engine
@@ -144,15 +191,15 @@ class MouseHarvester:
 
     def on_move(self, x, y):
         if self.active:
-            # STABILITY FIX: Only process 1 out of every 10 events.
+            # STABILITY FIX: Only process 1 out of every 32 events.
             # Without this, moving the mouse generates ~500 events/sec,
             # causing the "30-second crash" you saw.
-            self.counter += 1
-            if self.counter % 20 != 0:
+            # PERF: Power-of-two mask, so the skip check is one AND.
+            self.counter = (self.counter + 1) & 31
+            if self.counter:
                 return
 
-            t = time.time_ns()
-            self.engine.inject_entropy("MOUSE_MOV", f"{x}{y}{t}".encode())
+            self.engine.inject_entropy("MOUSE_MOV", MOUSE_MOVE.pack(int(x), int(y), time.time_ns()))
 
     def on_click(self, x, y, button, pressed):
         if self.active:
@@ -93,7 +93,7 @@ def update_gui():
     metrics = engine.get_metrics()
     
     # Update Plots and Stats
-    dpg.set_value("series_entropy", [list(range(len(metrics["history"]))), metrics["history"]])
+    dpg.set_value("series_entropy", [metrics["history_x"], metrics["history"]])
     dpg.set_value("txt_bytes", f"Bytes Harvested: {metrics['total_bytes']}")
     
     # Entropy Quality (Now uses the fixed Display Pool math)
@@ -189,4 +189,9 @@ while dpg.is_dearpygui_running():
 for h in harvesters.values():
     if hasattr(h, 'stop_event'):
         h.stop_event.set()
+# Let each harvester thread exit and release its device (hwrng fd, camera)
+for h in harvesters.values():
+    if hasattr(h, 'stop_event') and h.is_alive():
+        h.join(timeout=1.0)
+engine.shutdown()
 dpg.destroy_context()
\ No newline at end of file
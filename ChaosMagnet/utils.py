@@ -1,31 +1,128 @@
 # utils.py
-import math
+import struct
+import threading
 import time
-from collections import Counter
+import numpy as np
 
-def calculate_shannon_entropy(data_bytes):
-    if not data_bytes:
+# Optional: JIT for the fused health-check kernel
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+def _scan_bytes(a):
+    """Single pass over a uint8 array: (longest run, 256-bin histogram)."""
+    hist = np.zeros(256, dtype=np.int64)
+    max_run = 0
+    run = 0
+    last = -1
+    for i in range(a.size):
+        v = np.int64(a[i])
+        hist[v] += 1
+        if v == last:
+            run += 1
+        else:
+            run = 1
+            last = v
+        if run > max_run:
+            max_run = run
+    return max_run, hist
+
+if HAS_NUMBA:
+    # Compiled on first call, then cached on disk across runs
+    _scan_bytes = njit(cache=True, boundscheck=False)(_scan_bytes)
+
+def entropy_from_histogram(counts, total):
+    """Shannon entropy (bits/byte) of a 256-bin byte histogram."""
+    if total <= 0:
         return 0.0
-    length = len(data_bytes)
-    counts = Counter(data_bytes)
-    entropy = 0.0
-    for count in counts.values():
-        p_x = count / length
-        entropy -= p_x * math.log2(p_x)
-    return entropy
+    nz = counts[counts > 0].astype(np.float64)
+    p = nz / total
+    return float(-(p * np.log2(p)).sum())
+
+# --- Uplink Wire Format (mirrored by Ayatoki's /ingest_bin handler in function.py) ---
+# u32 frame_len (bytes after this field) | u64 seq | f64 ts_epoch
+# | f64 entropy_estimate | u16 source_id | u16 payload_len | payload
+FRAME_HEADER = struct.Struct("<IQddHH")
+SOURCE_IDS = {"SYS": 1, "TRNG": 2, "AUDIO": 3, "VIDEO": 4, "MOUSE_MOV": 5, "MOUSE_CLK": 6}
 
-def get_timestamp():
-    return time.strftime("%Y-%m-%d %H:%M:%S")
+def pack_frame(seq, ts_epoch, entropy_estimate, source_name, payload):
+    """Length-prefixed binary uplink frame. The payload is the raw whitened digest."""
+    return FRAME_HEADER.pack(
+        FRAME_HEADER.size - 4 + len(payload), seq, ts_epoch, entropy_estimate,
+        SOURCE_IDS.get(source_name, 0), len(payload)
+    ) + payload
+
+_ts_cache = (0, "")
+
+def get_timestamp(now=None):
+    # PERF: strftime only once per second; callers in the same second share it
+    global _ts_cache
+    sec = int(time.time() if now is None else now)
+    if sec != _ts_cache[0]:
+        _ts_cache = (sec, time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec)))
+    return _ts_cache[1]
 
 def fmt_bytes(b_data):
     return b_data.hex().upper()
 
+class RingBuffer:
+    """
+    Bounded ring for the harvester -> worker hand-off.
+    Producers only serialize on a plain Lock (no Condition/notify like
+    queue.Queue); the single consumer reads lock-free because it is the
+    only writer of 'head'. A full ring drops the new item.
+    """
+    def __init__(self, capacity=1024):
+        # Round up to a power of two so indices wrap with a mask
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self.slots = [None] * size
+        self.mask = size - 1
+        self.head = 0
+        self.tail = 0
+        self._put_lock = threading.Lock()
+
+    def put_nowait(self, item):
+        """Returns False (and drops the item) if the ring is full."""
+        with self._put_lock:
+            tail = self.tail
+            next_tail = (tail + 1) & self.mask
+            if next_tail == self.head:
+                return False
+            self.slots[tail] = item
+            self.tail = next_tail
+        return True
+
+    def get_nowait(self):
+        """Single consumer only. Returns None if the ring is empty."""
+        head = self.head
+        if head == self.tail:
+            return None
+        item = self.slots[head]
+        self.slots[head] = None
+        self.head = (head + 1) & self.mask
+        return item
+
+    def __len__(self):
+        return (self.tail - self.head) & self.mask
+
 class HealthMonitor:
     """
     Implements lightweight health checks inspired by NIST SP 800-90B.
     Prevents low-quality entropy (like stuck pixels or muted mics) 
     from contaminating the pool.
     """
+    @staticmethod
+    def _max_run(a):
+        """Longest run of identical values in a uint8 array."""
+        # PERF: Vectorized run-length scan (C-level compare, no per-byte bytecode)
+        changes = np.flatnonzero(np.diff(a)) + 1
+        boundaries = np.concatenate(([0], changes, [a.size]))
+        return int(np.diff(boundaries).max())
+
     @staticmethod
     def repetition_count_test(data, cutoff=10):
         """
@@ -33,21 +130,10 @@ class HealthMonitor:
         Returns: (Passed Bool, Details String)
         """
         if not data: return True, "Empty"
-        
-        max_repeats = 0
-        current_repeats = 0
-        last_val = None
-        
-        for byte in data:
-            if byte == last_val:
-                current_repeats += 1
-            else:
-                max_repeats = max(max_repeats, current_repeats)
-                current_repeats = 1
-                last_val = byte
-                
-        max_repeats = max(max_repeats, current_repeats)
-        
+        if len(data) < cutoff: return True, "OK"
+
+        max_repeats = HealthMonitor._max_run(np.frombuffer(data, dtype=np.uint8))
+
         if max_repeats >= cutoff:
             return False, f"RCT Fail (Repeats: {max_repeats})"
         return True, "OK"
@@ -60,10 +146,31 @@ class HealthMonitor:
         if not data: return True, "Empty"
         
         # Find most common byte
-        counts = Counter(data)
-        most_common = counts.most_common(1)[0] # (byte, count)
-        ratio = most_common[1] / len(data)
+        a = np.frombuffer(data, dtype=np.uint8)
+        ratio = int(np.bincount(a, minlength=256).max()) / a.size
         
         if ratio > cutoff_ratio:
             return False, f"APT Fail (Dominance: {ratio:.2%})"
-        return True, "OK"
\ No newline at end of file
+        return True, "OK"
+
+    @staticmethod
+    def check(data, rct_cutoff=10, apt_cutoff=0.40):
+        """
+        Fused RCT + APT over a single uint8 view of the sample.
+        Returns: (Passed Bool, 256-bin counts array or None if empty)
+        """
+        if not data: return True, None
+
+        a = np.frombuffer(data, dtype=np.uint8)
+        if HAS_NUMBA:
+            # PERF: Run length + histogram in one compiled walk, no temporaries
+            max_run, counts = _scan_bytes(a)
+            passed = max_run < rct_cutoff and int(counts.max()) <= apt_cutoff * a.size
+            return passed, counts
+
+        counts = np.bincount(a, minlength=256)
+        if int(counts.max()) / a.size > apt_cutoff:
+            return False, counts
+        if a.size >= rct_cutoff and HealthMonitor._max_run(a) >= rct_cutoff:
+            return False, counts
+        return True, counts
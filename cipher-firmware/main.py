@@ -441,8 +441,12 @@ class ciphertanSystem:
             self.log_debug(f"Command: {command}")
 
             try:
+                # Compact RGB frame from hosts that saw rgb=hex in VER?
+                if command[0] == "#":
+                    self.handle_rgb_hex(command[1:])
+
                 # RGB command
-                if command.startswith("RGB:"):
+                elif command.startswith("RGB:"):
                     self.handle_rgb(command[4:])
 
                 # Brightness
@@ -552,18 +556,32 @@ class ciphertanSystem:
             if not all(0 <= val <= 255 for val in [r, g, b]):
                 raise ValueError("RGB values must be 0-255")
             
-            if self.hardware.set_color(r, g, b):
-                self.stats["rgb_updates"] += 1
-                self.log_debug(f"RGB: ({r}, {g}, {b})")
-                
-                if random.random() < 0.02:  # 2% chance for RGB quip
-                    self.speak("rgb_chaos")
-            else:
-                self.log_error("RGB update failed")
+            self._apply_rgb(r, g, b)
         
         except Exception as e:
             self.log_error(f"RGB command error: {e}")
     
+    def handle_rgb_hex(self, hex_data):
+        """Handle compact '#rrggbb' RGB frame"""
+        try:
+            if len(hex_data) != 6:
+                raise ValueError("Need exactly 6 hex digits")
+            value = int(hex_data, 16)
+            self._apply_rgb(value >> 16, (value >> 8) & 0xFF, value & 0xFF)
+        
+        except Exception as e:
+            self.log_error(f"RGB command error: {e}")
+    
+    def _apply_rgb(self, r, g, b):
+        if self.hardware.set_color(r, g, b):
+            self.stats["rgb_updates"] += 1
+            self.log_debug(f"RGB: ({r}, {g}, {b})")
+            
+            if random.random() < 0.02:  # 2% chance for RGB quip
+                self.speak("rgb_chaos")
+        else:
+            self.log_error("RGB update failed")
+    
     def handle_brightness(self, bri_data):
         """Handle brightness with bounds checking"""
         try:
@@ -652,7 +670,7 @@ class ciphertanSystem:
     
     def handle_version(self):
         """Send version info"""
-        print(f"{VERSION} | {DEVICE_ID} | pin={self.hardware.led_pin} | brightness={self.brightness:.2f} | type={self.hardware.led_type}")
+        print(f"{VERSION} | {DEVICE_ID} | pin={self.hardware.led_pin} | brightness={self.brightness:.2f} | type={self.hardware.led_type} | rgb=hex")
     
     def handle_status(self):
         """Send detailed status"""
@@ -8,16 +8,21 @@ import time
 import machine
 import neopixel
 import random
-import ubinascii
-import hashlib
 import os
 import gc
 import uselect
+import micropython
+from micropython import const
 from machine import Timer, Pin, freq
 
 VERSION = "Echo-tan Enhanced v2.5 (Guardian)"
 DEVICE_ID = "echo@cobra-mesh"
 CFG_PATH = "echo_cfg.json"
+CFG_SAVE_DELAY_MS = 3000  # Quiet time before a changed config hits flash
+TRNG_MAX_BURST = 8  # Max 32-byte samples per "TRNG:" line
+GC_INTERVAL_MS = 2000  # Main loop considers a GC at most this often
+GC_FREE_LOW = 16 * 1024  # ...and only collects below this much free heap
+USB_JITTER_MASK = 0xFF  # USB jitter ring is 256 bytes; size must stay a power of two
 
 # Configuration with same structure as Cipher
 DEFAULTS = {
@@ -30,54 +35,197 @@ DEFAULTS = {
     "rgb_pins": [47, 21, 14]
 }
 
-# Echo personality - Calm, precise, validating
+# Echo personality - Calm, precise, validating (tuples: cheap indexing, no list churn)
 ECHO_PERSONALITY = {
-    "startup": [
+    "startup": (
         "[echo] Systems awakening. Entropy validation protocols online.",
         "[echo] Echo-tan initialized. Listening to the noise floor.",
         "[echo] Guardian mode engaged. Only pure randomness passes through.",
         "[echo] My circuits are calm. Ready to witness chaos with clarity.",
         "[echo] Internal health monitors active. Streaming begins."
-    ],
-    "rgb_glow": [
+    ),
+    "rgb_glow": (
         "[echo] Soft glow aligned. LED breathing in teal and dusk.",
         "[echo] My light is measured, like my judgments.",
         "[echo] Cyan waves ripple across silicon.",
         "[echo] The LED reflects my inner calm.",
         "[echo] Gentle luminescence for gentle auditing."
-    ],
-    "health_pass": [
+    ),
+    "health_pass": (
         "[echo] Internal health verified. Streaming pure entropy.",
         "[echo] Noise floor validated. All tests nominal.",
         "[echo] Quality metrics within bounds. Proceeding.",
         "[echo] Health check passed. Silent approval granted.",
         "[echo] Entropy validated. Audit frame captured."
-    ],
-    "health_fail": [
+    ),
+    "health_fail": (
         "[echo] Deviation detected. Sample rejected.",
         "[echo] Quality below threshold. Withholding sample.",
         "[echo] Health test failed. Recalibrating sensors.",
         "[echo] Anomaly detected. Data gate closed.",
         "[echo] Bias detected. Refusing to forward."
-    ],
-    "audit": [
+    ),
+    "audit": (
         "[echo] Audit frame captured. Ready for judgment.",
         "[echo] Key observed and recorded. My audit stands witness.",
         "[echo] Another secret shaped. I will remember their origin.",
         "[echo] Signature verified. Provenance chain intact.",
         "[echo] Entropy validated. All tests nominal. Proceeding."
-    ],
-    "errors": [
+    ),
+    "errors": (
         "[echo] Every signal is a heartbeat. Every error, a sigh.",
         "[echo] Minor irregularity noted. Compensation applied.",
-        "[echo] Even guardians stumble. Recov
-
-ering gracefully.",
+        "[echo] Even guardians stumble. Recovering gracefully.",
         "[echo] System hiccup logged. Stability restored.",
         "[echo] Error acknowledged. Returning to equilibrium."
-    ]
+    )
 }
 
+# Per-byte bit tables for the health checks (bit 0 = first bit in stream)
+POPCOUNT = bytes(bin(i).count("1") for i in range(256))
+
+def _edge_runs():
+    lo = bytearray(256)
+    hi = bytearray(256)
+    for i in range(256):
+        n = 1
+        while n < 8 and ((i >> n) & 1) == (i & 1):
+            n += 1
+        lo[i] = n
+        n = 1
+        while n < 8 and ((i >> (7 - n)) & 1) == (i >> 7):
+            n += 1
+        hi[i] = n
+    return bytes(lo), bytes(hi)
+
+# Length of the run starting at bit 0 / ending at bit 7
+BIT_RUN_LO, BIT_RUN_HI = _edge_runs()
+
+# Viper kernel wants one buffer: [0:256] popcount, [256:512] run lo, [512:768] run hi
+HC_TABLES = POPCOUNT + BIT_RUN_LO + BIT_RUN_HI
+
+_RCT_CUTOFF = const(30)
+_RCT_WARN = const(24)       # int(_RCT_CUTOFF * 0.8)
+_APT_BYTES = const(64)      # 512-bit window
+_APT_FAIL_LO = const(190)   # ones-count bounds over the 512-bit window
+_APT_FAIL_HI = const(322)
+_APT_WARN_LO = const(210)
+_APT_WARN_HI = const(302)
+_HC_APT_OFS = const(8)      # apt window offset inside the state buffer
+# Health state buffer layout:
+#   [0] apt_idx  [1:3] apt_ones (LE)  [3] rct_last_bit (2 = none)
+#   [4:6] rct_run_length (LE, saturating)  [6] apt_filled  [8:72] apt window
+
+@micropython.viper
+def _hc_kernel(data: ptr8, n: int, state: ptr8, tables: ptr8) -> int:
+    """RCT + APT over n bytes. Returns bit0 = failed, bit1 = warned. No allocations."""
+    apt_idx = state[0]
+    apt_ones = state[1] | (state[2] << 8)
+    last = state[3]
+    run = state[4] | (state[5] << 8)
+    filled = state[6]
+    status = 0
+    for i in range(n):
+        b = data[i]
+        
+        # RCT: extend the carried run by this byte's leading bit-run
+        low_run = tables[256 + b]
+        if (b & 1) == last:
+            run += low_run
+        else:
+            run = low_run
+        if run > _RCT_CUTOFF:
+            status |= 1
+        elif run > _RCT_WARN:
+            status |= 2
+        if low_run == 8:
+            last = b & 1
+        else:
+            run = tables[512 + b]
+            last = b >> 7
+        
+        # APT: byte-granular sliding popcount
+        apt_ones += tables[b] - tables[state[_HC_APT_OFS + apt_idx]]
+        state[_HC_APT_OFS + apt_idx] = b
+        apt_idx += 1
+        if apt_idx == _APT_BYTES:
+            apt_idx = 0
+            filled = 1
+        if filled != 0:
+            if apt_ones < _APT_FAIL_LO or apt_ones > _APT_FAIL_HI:
+                status |= 1
+            elif apt_ones < _APT_WARN_LO or apt_ones > _APT_WARN_HI:
+                status |= 2
+    
+    if run > 0xFFFF:
+        run = 0xFFFF
+    state[0] = apt_idx
+    state[1] = apt_ones & 0xFF
+    state[2] = apt_ones >> 8
+    state[3] = last
+    state[4] = run & 0xFF
+    state[5] = run >> 8
+    state[6] = filled
+    return status
+
+@micropython.viper
+def _hex_into(dst: ptr8, ofs: int, src: ptr8, n: int):
+    """Lowercase hex of src[0:n] written to dst[ofs:ofs+2n]. No allocations."""
+    for i in range(n):
+        b = src[i]
+        hi = b >> 4
+        lo = b & 0xF
+        if hi < 10:
+            dst[ofs + 2 * i] = hi + 48
+        else:
+            dst[ofs + 2 * i] = hi + 87
+        if lo < 10:
+            dst[ofs + 2 * i + 1] = lo + 48
+        else:
+            dst[ofs + 2 * i + 1] = lo + 87
+
+@micropython.viper
+def _jitter_probe(seed: int) -> int:
+    """Fixed integer workload; only its wall time matters (scheduler/ISR jitter)."""
+    x = seed | 1
+    for i in range(64):
+        x ^= x << 13
+        x ^= x >> 17
+        x ^= x << 5
+    return x
+
+def _arg_uint(cmd, start, field, default):
+    """
+    Unsigned decimal in the `field`-th comma-separated slot after cmd[start:].
+    Scans in place (str, bytes or memoryview) - no split() lists or slices.
+    Missing/empty slot -> default; anything but digits/spaces -> ValueError.
+    """
+    i = start
+    end = len(cmd)
+    # Skip to the requested slot: slot 0 follows the first ','
+    while field >= 0:
+        while i < end and cmd[i] not in (",", 0x2C):
+            i += 1
+        if i == end:
+            return default
+        i += 1
+        field -= 1
+    value = 0
+    digits = 0
+    while i < end:
+        c = cmd[i]
+        if not isinstance(c, int):
+            c = ord(c)
+        if c == 0x2C:
+            break
+        if 0x30 <= c <= 0x39:
+            value = value * 10 + c - 0x30
+            digits += 1
+        elif c != 0x20:
+            raise ValueError("bad number")
+        i += 1
+    return value if digits else default
+
 class EchoHardware:
     """Hardware abstraction layer - same as Cipher but with Echo identity"""
     
@@ -92,8 +240,21 @@ class EchoHardware:
         self.rgb_leds = None
         self.current_color = (0, 0, 0)
         
+        # raw channel -> brightness-scaled channel
+        self._bri_lut = bytearray(256)
+        self._rebuild_lut()
+        
         self.init_led()
     
+    def _rebuild_lut(self):
+        """Precompute scaled channel values (only when brightness changes)"""
+        for i in range(256):
+            self._bri_lut[i] = int(i * self.brightness)
+    
+    def set_brightness(self, brightness):
+        self.brightness = brightness
+        self._rebuild_lut()
+    
     def init_led(self):
         """Initialize LED with fallback"""
         if self.led_type == "ws2812":
@@ -146,12 +307,14 @@ class EchoHardware:
             self.rgb_leds = None
             return False
     
+    @micropython.native
     def set_color(self, r, g, b):
         """Set LED color with brightness"""
         try:
-            r = int((r & 0xFF) * self.brightness)
-            g = int((g & 0xFF) * self.brightness)
-            b = int((b & 0xFF) * self.brightness)
+            lut = self._bri_lut
+            r = lut[r & 0xFF]
+            g = lut[g & 0xFF]
+            b = lut[b & 0xFF]
             
             self.current_color = (r, g, b)
             
@@ -176,25 +339,60 @@ class EchoSystem:
     def __init__(self):
         # Load config
         self.config = self.load_config()
+        # Last-written snapshot + pending-save timestamp (debounced flash writes)
+        self._cfg_saved = json.dumps(self.config)
+        self._cfg_dirty_at = None
         
         # Initialize hardware
         self.hardware = EchoHardware(self.config)
+        self._build_stat_prefix()
         
         # System state
         self.brightness = self.config["brightness"]
         self.personality_level = self.config["personality_level"]
+        # Quip gate as an 8-bit integer compare (level 1.0 -> always)
+        self._pers_threshold = int(self.personality_level * 256)
         self.debug_mode = self.config["debug_mode"]
         
+        # Hot-path bindings: skip the module + attribute lookups per call
+        self._ticks_ms = time.ticks_ms
+        self._ticks_us = time.ticks_us
+        self._ticks_diff = time.ticks_diff
+        self._rand = random.random
+        self._getrandbits = random.getrandbits
+        
         # Performance tracking
         self.command_count = 0
         self.last_quip_time = 0
-        self.system_start_time = time.ticks_ms()
+        self.system_start_time = self._ticks_ms()
         self.error_count = 0
         
         # TRNG streaming
         self.trng_timer = None
         self.trng_rate_hz = 10
+        # Bound once: creating a bound method inside the ISR would allocate
+        self._tick_irq_cb = self._tick_irq
+        self._stream_tick_cb = self.stream_tick
         self.streaming = False
+        # Burst framing: `burst` samples are hex-concatenated into one line,
+        # "TRNG:" + 64*burst hex chars + "\n", to amortize UART writes
+        self._burst = 4
+        self._burst_idx = 0
+        self._out = bytearray(5 + 64 * TRNG_MAX_BURST + 1)
+        self._out[0:5] = b"TRNG:"
+        self._set_burst(self._burst)
+        
+        # Command dispatch tables (see handle_command)
+        self._exact_cmds = {
+            "VER?": self.handle_version,
+            "STAT?": self.handle_status,
+            "RESET": self.handle_reset
+        }
+        self._prefix_cmds = (
+            (4, {"RGB:": self.handle_rgb, "BRI:": self.handle_brightness, "PIN:": self.handle_pin_change}),
+            (6, {"DEBUG:": self.handle_debug_mode}),
+            (12, {"PERSONALITY:": self.handle_personality})
+        )
         
         # Phase 2: Health monitoring (NIST SP 800-90B inspired)
         self.total_bytes_generated = 0
@@ -203,28 +401,45 @@ class EchoSystem:
         self.keys_audited = 0
         self.last_health_status = "OK"
         
-        # RCT (Repetition Count Test) state
-        self.rct_last_bit = None
-        self.rct_run_length = 0
-        self.rct_cutoff = 30
-        
-        # APT (Adaptive Proportion Test) state
-        self.apt_buffer = []
-        self.apt_ones = 0
-        self.apt_window = 512
+        # RCT (Repetition Count Test) + APT (Adaptive Proportion Test) state
+        # Lives in one buffer owned by the viper kernel (see _hc_kernel)
+        # Thresholds are consts baked into the kernel; mirrored here read-only
+        self.rct_cutoff = _RCT_CUTOFF
+        self.rct_warn_cutoff = _RCT_WARN
+        self.apt_window = _APT_BYTES * 8
+        self.apt_fail_lo = _APT_FAIL_LO
+        self.apt_fail_hi = _APT_FAIL_HI
+        self.apt_warn_lo = _APT_WARN_LO
+        self.apt_warn_hi = _APT_WARN_HI
+        self._hc_state = bytearray(_HC_APT_OFS + _APT_BYTES)
+        self._hc_state[3] = 2  # no previous bit yet
         
         # USB jitter entropy
-        self.usb_jitter_buffer = bytearray(256)
+        self.usb_jitter_buffer = bytearray(USB_JITTER_MASK + 1)
         self.usb_j_idx = 0
-        self.last_rx_us = time.ticks_us()
-        
-        # Statistics
-        self.stats = {
-            "rgb_updates": 0,
-            "commands_processed": 0,
-            "uptime_ms": 0,
-            "free_memory": 0
-        }
+        
+        # generate_trng scratch: mixed output and per-tick timing samples
+        self._mix = bytearray(32)
+        self._timing = bytearray(16)
+        self._mv_mix = memoryview(self._mix)
+        self.last_rx_us = self._ticks_us()
+        
+        # Command RX: bytes land in a reusable buffer until '\n' (see _read_line)
+        self._rx = bytearray(256)
+        self._rx_len = 0
+        self._rx_byte = bytearray(1)
+        self._rx_mv = memoryview(self._rx)
+        
+        # GC pacing: time-based in main_loop, plus an allocation threshold
+        # so the heap also collects itself before it runs dry
+        self._last_gc_ms = self._ticks_ms()
+        try:
+            gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
+        except:
+            pass
+        
+        # Statistics (uptime and free memory are computed when STATUS asks)
+        self.rgb_updates = 0
         
         # Set CPU frequency
         try:
@@ -268,10 +483,20 @@ class EchoSystem:
             return DEFAULTS.copy()
     
     def save_config(self):
-        """Save configuration"""
+        """Queue a config save; main_loop flushes it after CFG_SAVE_DELAY_MS"""
+        self._cfg_dirty_at = self._ticks_ms()
+        return True
+    
+    def flush_config(self):
+        """Write configuration to flash, skipping the write if nothing changed"""
+        self._cfg_dirty_at = None
         try:
+            data = json.dumps(self.config)
+            if data == self._cfg_saved:
+                return True
             with open(CFG_PATH, "w") as f:
-                json.dump(self.config, f)
+                f.write(data)
+            self._cfg_saved = data
             return True
         except Exception as e:
             print(f"[ERROR] Config save failed: {e}")
@@ -279,16 +504,17 @@ class EchoSystem:
     
     def speak(self, category, force=False):
         """Echo personality system"""
-        current_time = time.ticks_ms()
+        current_time = self._ticks_ms()
         
-        if not force and time.ticks_diff(current_time, self.last_quip_time) < 2000:
+        if not force and self._ticks_diff(current_time, self.last_quip_time) < 2000:
             return
         
-        if not force and random.random() > self.personality_level:
+        if not force and self._getrandbits(8) >= self._pers_threshold:
             return
         
-        if category in ECHO_PERSONALITY:
-            message = random.choice(ECHO_PERSONALITY[category])
+        msgs = ECHO_PERSONALITY.get(category)
+        if msgs:
+            message = msgs[self._getrandbits(8) % len(msgs)]
             print(message)
             self.last_quip_time = current_time
     
@@ -305,58 +531,21 @@ class EchoSystem:
         if self.debug_mode:
             print(f"[DEBUG] {message}")
     
-    def update_stats(self):
-        """Update statistics"""
-        self.stats["uptime_ms"] = time.ticks_diff(time.ticks_ms(), self.system_start_time)
-        try:
-            self.stats["free_memory"] = gc.mem_free()
-        except:
-            self.stats["free_memory"] = -1
-    
+    @micropython.native
     def _push_usb_jitter(self, jitter_byte):
         """Collect USB timing jitter"""
         try:
             self.usb_jitter_buffer[self.usb_j_idx] = jitter_byte & 0xFF
-            self.usb_j_idx = (self.usb_j_idx + 1) % len(self.usb_jitter_buffer)
+            self.usb_j_idx = (self.usb_j_idx + 1) & USB_JITTER_MASK
         except:
             pass
     
     def check_health(self, data):
         """Phase 2: Internal health checks (RCT + APT)"""
-        failed = False
-        warned = False
-        
-        for byte in data:
-            for i in range(8):
-                bit = (byte >> i) & 1
-                
-                # RCT: Repetition Count Test
-                if bit == self.rct_last_bit:
-                    self.rct_run_length += 1
-                    if self.rct_run_length > self.rct_cutoff:
-                        failed = True
-                    elif self.rct_run_length > (self.rct_cutoff * 0.8):
-                        warned = True
-                else:
-                    self.rct_last_bit = bit
-                    self.rct_run_length = 1
-                
-                # APT: Adaptive Proportion Test
-                self.apt_buffer.append(bit)
-                if bit == 1:
-                    self.apt_ones += 1
-                
-                if len(self.apt_buffer) > self.apt_window:
-                    popped = self.apt_buffer.pop(0)
-                    if popped == 1:
-                        self.apt_ones -= 1
-                
-                if len(self.apt_buffer) == self.apt_window:
-                    # Expect ~256 ones in 512 bits, with bounds
-                    if self.apt_ones < 190 or self.apt_ones > 322:
-                        failed = True
-                    elif self.apt_ones < 210 or self.apt_ones > 302:
-                        warned = True
+        # Native kernel does the per-byte work; wrapper keeps the bookkeeping
+        status = _hc_kernel(data, len(data), self._hc_state, HC_TABLES)
+        failed = status & 1
+        warned = status & 2
         
         if failed:
             self.health_failures += 1
@@ -370,53 +559,75 @@ class EchoSystem:
             self.last_health_status = "OK"
             return True
     
-    def generate_trng(self, num_bytes=32):
-        """Generate high-quality entropy with health gating"""
+    def generate_trng(self):
+        """
+        Generate 32 bytes of entropy into the persistent mix buffer.
+        Returns a view of it - valid only until the next call (read-only use).
+        """
+        mix = self._mix
+        timing = self._timing
         try:
-            # Primary TRNG
-            base_entropy = os.urandom(num_bytes)
+            # Primary TRNG (the one remaining per-tick allocation)
+            mix[:] = os.urandom(32)
             
-            # Add timing entropy
-            timing_samples = []
+            # Add timing entropy (jitter of a cheap fixed workload, not SHA-256)
             for i in range(16):
-                start = time.ticks_us()
-                dummy = hashlib.sha256(base_entropy[i:i+8] if i+8 <= len(base_entropy) else base_entropy).digest()
-                end = time.ticks_us()
-                timing_samples.append(time.ticks_diff(end, start) & 0xFF)
+                start = self._ticks_us()
+                _jitter_probe(start)
+                timing[i] = self._ticks_diff(self._ticks_us(), start) & 0xFF
             
             # Mix entropy sources
-            mixed = bytearray(base_entropy)
-            for i, timing in enumerate(timing_samples):
-                if i < len(mixed):
-                    mixed[i] ^= timing
+            for i in range(16):
+                mix[i] ^= timing[i]
             
             # Add USB jitter
-            for i in range(min(len(mixed), 32)):
-                usb_byte = self.usb_jitter_buffer[(self.usb_j_idx + i) % len(self.usb_jitter_buffer)]
-                mixed[i] ^= usb_byte
-            
-            return bytes(mixed)
+            for i in range(32):
+                usb_byte = self.usb_jitter_buffer[(self.usb_j_idx + i) & USB_JITTER_MASK]
+                mix[i] ^= usb_byte
         except Exception as e:
             self.log_error(f"TRNG generation failed: {e}")
-            return bytes([random.getrandbits(8) for _ in range(num_bytes)])
+            for i in range(32):
+                mix[i] = self._getrandbits(8)
+        return self._mv_mix
+    
+    def _set_burst(self, burst):
+        """Resize the TRNG output line for `burst` samples per write"""
+        self._burst = burst
+        self._burst_idx = 0
+        end = 5 + 64 * burst
+        self._out[end] = 0x0A
+        self._out_line = memoryview(self._out)[:end + 1]
+    
+    def _tick_irq(self, t):
+        """Timer IRQ: defer the real work so nothing allocates in ISR context"""
+        try:
+            micropython.schedule(self._stream_tick_cb, 0)
+        except RuntimeError:
+            # Schedule queue full - drop this tick rather than pile up
+            pass
     
+    @micropython.native
     def stream_tick(self, t):
-        """Timer callback for TRNG streaming - Phase 2 with health gating"""
+        """Scheduled TRNG streaming tick - Phase 2 with health gating"""
         if not self.streaming:
             return
         
         try:
             # Generate entropy
-            data = self.generate_trng(32)
+            data = self.generate_trng()
             
             # Phase 2: Health check BEFORE sending
             if self.check_health(data):
                 self.total_bytes_generated += len(data)
-                b64 = ubinascii.b2a_base64(data).strip().decode("ascii")
-                print(f"TRNG:{b64}")
+                # Hex into the preallocated line; write once the burst is full
+                _hex_into(self._out, 5 + 64 * self._burst_idx, data, 32)
+                self._burst_idx += 1
+                if self._burst_idx == self._burst:
+                    sys.stdout.write(self._out_line)
+                    self._burst_idx = 0
                 
                 # Occasional personality
-                if random.random() < 0.05:
+                if self._rand() < 0.05:
                     self.speak("health_pass")
             else:
                 # Health check failed - send failure signal
@@ -425,19 +636,19 @@ class EchoSystem:
         except Exception as e:
             print("TRNG:ERR")
     
+    @micropython.native
     def handle_command(self, command_line):
         """Full command processing like Cipher"""
         try:
             self.command_count += 1
-            self.stats["commands_processed"] = self.command_count
             command = command_line.strip()
             if not command:
                 return
             
             # USB jitter collection
             try:
-                now = time.ticks_us()
-                delta = time.ticks_diff(now, self.last_rx_us) & 0xFF
+                now = self._ticks_us()
+                delta = self._ticks_diff(now, self.last_rx_us) & 0xFF
                 self._push_usb_jitter(delta)
                 self.last_rx_us = now
             except:
@@ -446,75 +657,24 @@ class EchoSystem:
             self.log_debug(f"Command: {command}")
             
             try:
-                # RGB command
-                if command.startswith("RGB:"):
-                    self.handle_rgb(command[4:])
+                # Exact commands: VER?, STAT? (CRITICAL for GUI), RESET
+                handler = self._exact_cmds.get(command)
+                if handler:
+                    handler()
+                    return
                 
-                # Brightness
-                elif command.startswith("BRI:"):
-                    self.handle_brightness(command[4:])
-                
-                # LED Pin
-                elif command.startswith("PIN:"):
-                    self.handle_pin_change(command[4:])
-                
-                # Version
-                elif command == "VER?":
-                    self.handle_version()
-                
-                # Status (CRITICAL for GUI)
-                elif command == "STAT?":
-                    self.handle_status()
-                
-                # Debug mode
-                elif command.startswith("DEBUG:"):
-                    self.handle_debug_mode(command[6:])
-                
-                # Personality
-                elif command.startswith("PERSONALITY:"):
-                    self.handle_personality(command[12:])
+                # Prefixed commands, bucketed by prefix length: one dict hit per bucket
+                for n, table in self._prefix_cmds:
+                    handler = table.get(command[:n])
+                    if handler:
+                        handler(command[n:])
+                        return
                 
                 # TRNG streaming
-                elif command.startswith("TRNG:START"):
-                    try:
-                        parts = command.split(":")[1].split(",")
-                        rate = int(parts[1]) if len(parts) > 1 and parts[1] else 10
-                        rate = max(1, min(50, rate))
-                        self.trng_rate_hz = rate
-                        
-                        if self.trng_timer:
-                            try:
-                                self.trng_timer.deinit()
-                            except:
-                                pass
-                        
-                        self.streaming = True
-                        self.trng_timer = Timer(1)
-                        self.trng_timer.init(
-                            period=int(1000 // self.trng_rate_hz),
-                            mode=Timer.PERIODIC,
-                            callback=self.stream_tick
-                        )
-                        print("TRNG:STARTED")
-                        self.log_status(f"TRNG streaming started at {rate}Hz with health gating")
-                    except Exception as e:
-                        print("TRNG:ERR")
-                        self.log_error(f"TRNG start failed: {e}")
-                
+                if command.startswith("TRNG:START"):
+                    self.handle_trng_start(command)
                 elif command.startswith("TRNG:STOP"):
-                    try:
-                        self.streaming = False
-                        if self.trng_timer:
-                            self.trng_timer.deinit()
-                            self.trng_timer = None
-                        print("TRNG:STOPPED")
-                    except Exception as e:
-                        print("TRNG:ERR")
-                
-                # Reset
-                elif command == "RESET":
-                    self.handle_reset()
-                
+                    self.handle_trng_stop()
                 else:
                     self.log_error(f"Unknown command: {command}")
             
@@ -528,23 +688,66 @@ class EchoSystem:
             except:
                 pass
     
+    def handle_trng_start(self, command):
+        """TRNG:START[,rate_hz[,burst]]"""
+        try:
+            # "TRNG:START" is 10 chars; rate and burst follow as ,<n>,<n>
+            rate = _arg_uint(command, 10, 0, 10)
+            rate = 1 if rate < 1 else 50 if rate > 50 else rate
+            self.trng_rate_hz = rate
+            burst = _arg_uint(command, 10, 1, 4)
+            self._set_burst(1 if burst < 1 else TRNG_MAX_BURST if burst > TRNG_MAX_BURST else burst)
+            
+            if self.trng_timer:
+                try:
+                    self.trng_timer.deinit()
+                except:
+                    pass
+            
+            self.streaming = True
+            self.trng_timer = Timer(1)
+            self.trng_timer.init(
+                period=int(1000 // self.trng_rate_hz),
+                mode=Timer.PERIODIC,
+                callback=self._tick_irq_cb
+            )
+            print("TRNG:STARTED")
+            self.log_status(f"TRNG streaming started at {rate}Hz (burst {self._burst}) with health gating")
+        except Exception as e:
+            print("TRNG:ERR")
+            self.log_error(f"TRNG start failed: {e}")
+    
+    def handle_trng_stop(self):
+        try:
+            self.streaming = False
+            if self.trng_timer:
+                self.trng_timer.deinit()
+                self.trng_timer = None
+            print("TRNG:STOPPED")
+        except Exception as e:
+            print("TRNG:ERR")
+    
     def handle_rgb(self, rgb_data):
         """Handle RGB command"""
         try:
-            parts = [x.strip() for x in rgb_data.split(",")]
+            # One split, no comprehensions (int() tolerates the surrounding spaces)
+            parts = rgb_data.split(",")
             if len(parts) != 3:
                 raise ValueError("Need 3 RGB values")
             
-            r, g, b = [int(x) for x in parts]
+            r = int(parts[0])
+            g = int(parts[1])
+            b = int(parts[2])
             
-            if not all(0 <= val <= 255 for val in [r, g, b]):
+            # Any bit outside 0..255 (including the sign) fails
+            if (r | g | b) & ~0xFF:
                 raise ValueError("RGB must be 0-255")
             
             if self.hardware.set_color(r, g, b):
-                self.stats["rgb_updates"] += 1
+                self.rgb_updates += 1
                 self.log_debug(f"RGB: ({r}, {g}, {b})")
                 
-                if random.random() < 0.02:
+                if self._rand() < 0.02:
                     self.speak("rgb_glow")
             else:
                 self.log_error("RGB update failed")
@@ -560,7 +763,7 @@ class EchoSystem:
                 raise ValueError("Brightness must be 0.01-1.0")
             
             self.brightness = brightness
-            self.hardware.brightness = brightness
+            self.hardware.set_brightness(brightness)
             self.config["brightness"] = brightness
             
             if self.save_config():
@@ -601,28 +804,45 @@ class EchoSystem:
     
     def handle_status(self):
         """Send detailed status - CRITICAL for GUI integration"""
-        self.update_stats()
-        
-        status = {
-            "version": VERSION,
-            "device_id": DEVICE_ID,
-            "uptime_ms": self.stats["uptime_ms"],
-            "commands": self.stats["commands_processed"],
-            "rgb_updates": self.stats["rgb_updates"],
-            "memory_free": self.stats["free_memory"],
-            "errors": self.error_count,
-            "led_pin": self.hardware.led_pin,
-            "led_type": self.hardware.led_type,
-            "brightness": self.brightness,
-            "trng_health": self.last_health_status,
-            "health_failures": self.health_failures,
-            "health_warnings": self.health_warnings,
-            "keys_audited": self.keys_audited,
-            "bytes_generated": self.total_bytes_generated,
-            "streaming": self.streaming,
-            "usb_entropy_bytes": int(self.usb_j_idx)
-        }
-        print(f"STATUS:{json.dumps(status)}")
+        try:
+            free = gc.mem_free()
+        except:
+            free = -1
+        
+        # Static fields are pre-serialized; rebuilt only if the LED pin/type moved
+        hw = self.hardware
+        if hw.led_pin != self._stat_pin or hw.led_type != self._stat_type:
+            self._build_stat_prefix()
+        
+        sys.stdout.write(
+            '%s"uptime_ms":%d,"commands":%d,"rgb_updates":%d,"memory_free":%d,"errors":%d,'
+            '"brightness":%s,"trng_health":"%s","health_failures":%d,"health_warnings":%d,'
+            '"keys_audited":%d,"bytes_generated":%d,"streaming":%s,"usb_entropy_bytes":%d}\n' % (
+                self._stat_prefix,
+                self._ticks_diff(self._ticks_ms(), self.system_start_time),
+                self.command_count,
+                self.rgb_updates,
+                free,
+                self.error_count,
+                self.brightness,
+                self.last_health_status,
+                self.health_failures,
+                self.health_warnings,
+                self.keys_audited,
+                self.total_bytes_generated,
+                "true" if self.streaming else "false",
+                self.usb_j_idx
+            )
+        )
+    
+    def _build_stat_prefix(self):
+        """Cache the JSON head of the STATUS line (fields that rarely change)"""
+        hw = self.hardware
+        self._stat_pin = hw.led_pin
+        self._stat_type = hw.led_type
+        self._stat_prefix = 'STATUS:{"version":%s,"device_id":%s,"led_pin":%d,"led_type":%s,' % (
+            json.dumps(VERSION), json.dumps(DEVICE_ID), hw.led_pin, json.dumps(hw.led_type)
+        )
     
     def handle_debug_mode(self, mode_data):
         """Toggle debug mode"""
@@ -651,6 +871,7 @@ class EchoSystem:
                 raise ValueError("Personality must be 0.0-1.0")
             
             self.personality_level = level
+            self._pers_threshold = int(level * 256)
             self.config["personality_level"] = level
             self.save_config()
             
@@ -666,6 +887,8 @@ class EchoSystem:
     def handle_reset(self):
         """System reset"""
         print("[echo] System resetting. Farewell.")
+        if self._cfg_dirty_at is not None:
+            self.flush_config()
         try:
             self.hardware.set_color(255, 50, 50)  # Soft red
             time.sleep_ms(500)
@@ -675,6 +898,29 @@ class EchoSystem:
             pass
         machine.reset()
     
+    def _read_line(self, poll):
+        """
+        Drain whatever stdin has ready into self._rx without blocking.
+        Returns the line length once '\n' arrives, else -1 (partial line kept).
+        readinto() on stdio blocks until the buffer is full, so feed it 1 byte.
+        """
+        rx = self._rx
+        one = self._rx_byte
+        stdin = sys.stdin.buffer
+        while poll.poll(0):
+            if not stdin.readinto(one):
+                break
+            c = one[0]
+            if c == 0x0A:
+                n = self._rx_len
+                self._rx_len = 0
+                return n
+            # Drop CR and anything past the buffer (overlong lines get truncated)
+            if c != 0x0D and self._rx_len < len(rx):
+                rx[self._rx_len] = c
+                self._rx_len += 1
+        return -1
+    
     def main_loop(self):
         """Main system loop"""
         print(f"[STATUS] Echo-tan main loop active - listening for commands")
@@ -687,18 +933,27 @@ class EchoSystem:
                 events = poll.poll(100)
                 
                 if events:
-                    line = sys.stdin.readline()
-                    if line:
-                        self.handle_command(line.strip())
+                    n = self._read_line(poll)
+                    if n > 0:
+                        # The only allocation per command: handlers work on str
+                        self.handle_command(str(self._rx_mv[:n], "utf-8"))
+                
+                # Debounced config write (brightness sweeps etc. hit flash once)
+                if self._cfg_dirty_at is not None and \
+                        self._ticks_diff(self._ticks_ms(), self._cfg_dirty_at) > CFG_SAVE_DELAY_MS:
+                    self.flush_config()
                 
-                # Periodic maintenance
-                if self.command_count > 0 and self.command_count % 50 == 0:
-                    gc.collect()
-                    if self.debug_mode:
-                        self.log_debug("Maintenance: GC run")
+                # Periodic maintenance, paced by wall clock rather than command rate
+                now = self._ticks_ms()
+                if self._ticks_diff(now, self._last_gc_ms) > GC_INTERVAL_MS:
+                    self._last_gc_ms = now
+                    if gc.mem_free() < GC_FREE_LOW:
+                        gc.collect()
+                        if self.debug_mode:
+                            self.log_debug("Maintenance: GC run")
                 
                 # Rare personality
-                if random.random() < 0.0005:
+                if self._rand() < 0.0005:
                     self.speak("audit")
             
             except KeyboardInterrupt:
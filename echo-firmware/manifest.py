@@ -0,0 +1,9 @@
+# Echo-tan frozen firmware manifest
+# Freezes main.py into the image so constants, ECHO_PERSONALITY and class
+# bodies live in flash (no bytecode compile at boot, less RAM).
+#
+# Build from the MicroPython ports/esp32 directory:
+#   make BOARD=ESP32_GENERIC_S3 FROZEN_MANIFEST=/path/to/echo-firmware/manifest.py
+
+include("$(PORT_DIR)/boards/manifest.py")
+freeze(".", "main.py")
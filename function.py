@@ -7,7 +7,6 @@ import os
 import sys
 import time
 import json
-import base64
 import binascii
 import hashlib
 import colorsys
@@ -16,14 +15,17 @@ import subprocess
 import socket
 import random
 import math
+import struct
+import queue
 from datetime import datetime
-from collections import deque
+from collections import deque, OrderedDict
 from pathlib import Path
-from http.server import BaseHTTPRequestHandler, HTTPServer # PHASE 3: Added for HTTP Ingest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer # PHASE 3: Added for HTTP Ingest
+from concurrent.futures import ThreadPoolExecutor
 
-from PySide6.QtCore import Qt, QObject, QThread, Signal, Slot, QTimer, QSize, QPoint, QEvent
+from PySide6.QtCore import Qt, QObject, QThread, Signal, Slot, QTimer, QSize, QPoint, QEvent, QCoreApplication
 from PySide6.QtGui import (QIcon, QAction, QPixmap, QColor, QTextCursor, QPainter, 
-                          QBrush, QLinearGradient, QPen, QFont, QPalette)
+                          QBrush, QLinearGradient, QPen, QFont, QPalette, QPolygon)
 from PySide6.QtWidgets import QWidget
 
 import serial
@@ -38,6 +40,57 @@ except ImportError:
     PQC_AVAILABLE = False
     print("[WARNING] PQC bindings not available. Classical crypto only.")
 
+# --- Optional numpy (vectorized byte math) ---
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# --- Optional numba (compiled audit kernels, needs numpy) ---
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# --- Optional orjson (serial STATUS/AUDIT parsing, ingest bodies, key/audit logs) ---
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers stay the same.
+# Both loads accept bytes (and memoryview), so callers can skip the .decode() step.
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _json_line(obj):
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    
+    def _json_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def _json_loads(data):
+        # json.loads takes str/bytes/bytearray but not memoryview
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+    
+    def _json_line(obj):
+        return (json.dumps(obj) + '\n').encode('utf-8')
+    
+    def _json_pretty(obj):
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+# Log timestamps: the local-time prefix is formatted once per second
+_iso_prefix = (None, "")
+
+def _iso_timestamp(t: float) -> str:
+    """time.time() value -> local ISO-8601 string (datetime.isoformat layout)"""
+    global _iso_prefix
+    sec = int(t)
+    cached = _iso_prefix
+    if cached[0] != sec:
+        cached = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec)))
+        _iso_prefix = cached
+    return f"{cached[1]}.{min(999999, round((t - sec) * 1e6)):06d}"
+
 # --- ML-KEM (FIPS 203) Support ---
 try:
     from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
@@ -49,12 +102,32 @@ except ImportError:
     print("[WARNING] ML-KEM support requires cryptography library")
 
 # --- Cobra Lab icon helpers ---
+def _build_icon_cache():
+    """File name -> resolved path for the images shipped next to this module"""
+    cache = {}
+    try:
+        with os.scandir(Path(__file__).parent) as entries:
+            for entry in entries:
+                if entry.name.endswith((".png", ".jpg")) and entry.is_file():
+                    cache[entry.name] = str(Path(entry.path).resolve())
+    except OSError:
+        pass
+    return cache
+
+# Icons don't change at runtime: one directory scan at import, no per-call stat()
+_ICON_CACHE = _build_icon_cache()
+
+# Icon file names per character, in order of preference
+_CHAR_ICON_CANDIDATES = {
+    "cipher": ("ciphericon.png", "ciphericon.jpg"),
+    "echo": ("echoicon.png", "echoicon.jpg"),
+    "ayatoki": ("ayatokiicon.png", "ayatoki-icon.png", "ayatokiicon.jpg"),
+    "mitsu": ("mitsuicon.png", "mitsuicon.jpg", "mitsu-icon.png"),
+}
+
 def _cc_icon_path():
     """Main Cobra Lab app icon (top-left + tray)"""
-    try:
-        return str((Path(__file__).parent / "icon.png").resolve())
-    except Exception:
-        return None
+    return _ICON_CACHE.get("icon.png")
 
 def _cc_char_icon_path(char_name: str = "cipher"):
     """
@@ -64,22 +137,10 @@ def _cc_char_icon_path(char_name: str = "cipher"):
       - ayatoki -> ayatokiicon.png / ayatoki-icon.png / .jpg
       - mitsu   -> mitsuicon.png / .jpg (PHASE 3)
     """
-    base = Path(__file__).parent
-    candidates = []
-
-    if char_name == "cipher":
-        candidates = ["ciphericon.png", "ciphericon.jpg"]
-    elif char_name == "echo":
-        candidates = ["echoicon.png", "echoicon.jpg"]
-    elif char_name == "ayatoki":
-        candidates = ["ayatokiicon.png", "ayatoki-icon.png", "ayatokiicon.jpg"]
-    elif char_name == "mitsu":
-        candidates = ["mitsuicon.png", "mitsuicon.jpg", "mitsu-icon.png"]
-
-    for name in candidates:
-        p = base / name
-        if p.exists():
-            return str(p.resolve())
+    for name in _CHAR_ICON_CANDIDATES.get(char_name, ()):
+        p = _ICON_CACHE.get(name)
+        if p:
+            return p
 
     # Fallback to main lab icon
     return _cc_icon_path()
@@ -113,6 +174,20 @@ def _cc_get_pixmap(size: int = 60, char_name: str = "cipher"):
     return pm
 # --- end helpers ---
 
+def _xor_prefix(data, pad):
+    """data with its first min(len) bytes XORed against pad (rest passes through)"""
+    out = bytearray(data)
+    n = min(len(out), len(pad))
+    if NUMPY_AVAILABLE:
+        a = np.frombuffer(bytes(data), dtype=np.uint8, count=n)
+        b = np.frombuffer(bytes(pad), dtype=np.uint8, count=n)
+        out[:n] = np.bitwise_xor(a, b).tobytes()
+    elif n:
+        # One bignum XOR instead of a per-byte Python loop
+        x = int.from_bytes(out[:n], "big") ^ int.from_bytes(bytes(pad[:n]), "big")
+        out[:n] = x.to_bytes(n, "big")
+    return out
+
 # Global Cobra Lab theme: Black + Red + Purple + Teal + Pink (Phase 3)
 CIPHER_COLORS = {
     'bg': '#0a0a0a',        # Pure black background
@@ -142,32 +217,125 @@ AUDIT_DIR.mkdir(parents=True, exist_ok=True)
 
 DEFAULT_LOG = LOGS_DIR / f"cipherchaos_session_{os.getpid()}.txt"
 
+# Per-key audit files go through one background writer: callers only enqueue.
+# Durability needs a data sync per file (a directory fsync only persists the
+# entries, not file contents), so each file is written with os.write and
+# fdatasync'd; each drained batch (up to AUDIT_BATCH_MAX files) then ends with
+# one directory fsync. All of it runs on the writer thread, never the GUI thread.
+AUDIT_QUEUE_MAX = 4096
+AUDIT_BATCH_MAX = 256
+AUDIT_WAIT_TIMEOUT = 0.5   # seconds a GUI-thread reader waits for one file
+AUDIT_FLUSH_TIMEOUT = 2.0  # total seconds shutdown waits for the backlog
+_AUDIT_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+_datasync = getattr(os, "fdatasync", os.fsync)  # fdatasync is POSIX-only
+_AUDIT_QUEUE = queue.Queue(maxsize=AUDIT_QUEUE_MAX)
+_audit_writer = None
+_audit_writer_lock = threading.Lock()
+_audit_pending = {}  # str(path) -> Event, set once that file is on disk
+
+def _audit_writer_loop():
+    while True:
+        batch = [_AUDIT_QUEUE.get()]
+        while len(batch) < AUDIT_BATCH_MAX:
+            try:
+                batch.append(_AUDIT_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        
+        for path, data, on_error, _ in batch:
+            try:
+                payload = memoryview(_json_pretty(data))
+                fd = os.open(str(path), _AUDIT_OPEN_FLAGS, 0o644)
+                try:
+                    while payload:
+                        payload = payload[os.write(fd, payload):]
+                    _datasync(fd)
+                finally:
+                    os.close(fd)
+            except Exception as e:
+                on_error(f"Audit log save failed: {e}")
+        
+        if hasattr(os, "O_DIRECTORY"):  # POSIX only; Windows has no directory fds
+            try:
+                fd = os.open(str(AUDIT_DIR), os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            except OSError:
+                pass
+        
+        with _audit_writer_lock:
+            for path, _, _, done in batch:
+                done.set()
+                if _audit_pending.get(str(path)) is done:
+                    del _audit_pending[str(path)]
+        for _ in batch:
+            _AUDIT_QUEUE.task_done()
+
+def _queue_audit_file(path, data, on_error):
+    """Hand an audit dict to the writer thread (blocks only if the queue is full)"""
+    global _audit_writer
+    done = threading.Event()
+    with _audit_writer_lock:
+        if _audit_writer is None:
+            _audit_writer = threading.Thread(target=_audit_writer_loop, daemon=True)
+            _audit_writer.start()
+        _audit_pending[str(path)] = done
+    _AUDIT_QUEUE.put((path, data, on_error, done))
+
+def _wait_audit_file(path, timeout=AUDIT_WAIT_TIMEOUT):
+    """Wait (bounded) for one queued audit file; True if it is not pending any more"""
+    with _audit_writer_lock:
+        done = _audit_pending.get(str(path))
+    return done is None or done.wait(timeout)
+
+def _flush_audit_queue(timeout=AUDIT_FLUSH_TIMEOUT):
+    """Wait up to timeout seconds in total for queued audit files; True if all landed"""
+    deadline = time.monotonic() + timeout
+    with _audit_writer_lock:
+        pending = list(_audit_pending.values())
+    for done in pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not done.wait(remaining):
+            return False
+    return True
+
 class PQCManager:
     """Post-Quantum Cryptography manager - Phase 2: Hybrid Kyber+Falcon"""
     
     def __init__(self):
         self.available = PQC_AVAILABLE
-        
+        # Module imported once at load time; keep a direct reference
+        self._pqc = pqcrypto_bindings if PQC_AVAILABLE else None
+        
+    @staticmethod
+    def _transcript(kyber_pk, ciphertext):
+        """32-byte BLAKE2b digest over Kyber pk || ciphertext (what Falcon signs)"""
+        h = hashlib.blake2b(digest_size=32)
+        h.update(kyber_pk)
+        h.update(ciphertext)
+        return h.digest()
+    
     def wrap_and_sign(self, classical_key):
         """Phase 2: Wrap with Kyber KEM, Sign with Falcon (Hybrid)"""
         if not self.available:
             raise Exception("PQC bindings not available")
         try:
-            import pqcrypto_bindings
+            pqc = self._pqc
             
             # 1. Kyber512 Key Encapsulation (Transport)
-            pk_kyber, sk_kyber = pqcrypto_bindings.kyber_keygen()
-            ciphertext, shared_secret = pqcrypto_bindings.kyber_encapsulate(pk_kyber)
+            pk_kyber, sk_kyber = pqc.kyber_keygen()
+            ciphertext, shared_secret = pqc.kyber_encapsulate(pk_kyber)
             
             # XOR classical key with Kyber shared secret
-            wrapped_key = bytearray(classical_key)
-            for i in range(min(len(wrapped_key), len(shared_secret))):
-                wrapped_key[i] ^= shared_secret[i]
+            wrapped_key = _xor_prefix(classical_key, shared_secret)
             
             # 2. Falcon512 Signature (Authenticity)
-            pk_falcon, sk_falcon = pqcrypto_bindings.falcon_keygen()
-            # Sign the ciphertext to prove authenticity
-            signature = pqcrypto_bindings.falcon_sign(sk_falcon, ciphertext)
+            pk_falcon, sk_falcon = pqc.falcon_keygen()
+            # Sign a transcript binding the Kyber public key to its ciphertext
+            transcript = self._transcript(pk_kyber, ciphertext)
+            signature = pqc.falcon_sign(sk_falcon, transcript)
             
             return {
                 'wrapped_key': bytes(wrapped_key),
@@ -177,6 +345,7 @@ class PQCManager:
                 'falcon_pk': bytes(pk_falcon),
                 'falcon_sk': bytes(sk_falcon),
                 'signature': bytes(signature),
+                'transcript': transcript,
                 'shared_secret': bytes(shared_secret),
                 'type': 'kyber512_falcon512_hybrid'
             }
@@ -188,13 +357,12 @@ class PQCManager:
         if not self.available:
             return False
         try:
-            import pqcrypto_bindings
-            
             pk = pqc_bundle['falcon_pk']
-            msg = pqc_bundle['ciphertext']  # We signed the ciphertext
+            # Recompute rather than trust the stored transcript
+            msg = self._transcript(pqc_bundle['kyber_pk'], pqc_bundle['ciphertext'])
             sig = pqc_bundle['signature']
             
-            return pqcrypto_bindings.falcon_verify(pk, msg, sig)
+            return self._pqc.falcon_verify(pk, msg, sig)
         except Exception as e:
             print(f"Signature Verification Error: {e}")
             return False
@@ -226,8 +394,7 @@ class PQCManager:
     def save_pqc_wrapped_key(self, wrapped_data, key_type, name=None):
         """Save PQC-wrapped key to disk"""
         if not name:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            name = f"{key_type}_{timestamp}"
+            name = f"{key_type}_{datetime.now():%Y%m%d_%H%M%S}"
         
         key_file = KEYS_DIR / f"{name}_wrapped.key"
         
@@ -237,13 +404,13 @@ class PQCManager:
         }
         
         if 'wrapped_key' in wrapped_data:
-            save_data['wrapped_key'] = base64.b64encode(wrapped_data['wrapped_key']).decode('ascii')
-            save_data['ciphertext'] = base64.b64encode(wrapped_data['ciphertext']).decode('ascii')
+            save_data['wrapped_key'] = binascii.b2a_base64(wrapped_data['wrapped_key'], newline=False).decode('ascii')
+            save_data['ciphertext'] = binascii.b2a_base64(wrapped_data['ciphertext'], newline=False).decode('ascii')
         else:
-            save_data['key'] = base64.b64encode(wrapped_data['key']).decode('ascii')
-            save_data['signature'] = base64.b64encode(wrapped_data['signature']).decode('ascii')
+            save_data['key'] = binascii.b2a_base64(wrapped_data['key'], newline=False).decode('ascii')
+            save_data['signature'] = binascii.b2a_base64(wrapped_data['signature'], newline=False).decode('ascii')
         
-        save_data['public_key'] = base64.b64encode(wrapped_data['public_key']).decode('ascii')
+        save_data['public_key'] = binascii.b2a_base64(wrapped_data['public_key'], newline=False).decode('ascii')
         
         with open(key_file, 'w') as f:
             json.dump(save_data, f, indent=2)
@@ -263,16 +430,40 @@ class EnhancedEntropyAuditor:
     
     def __init__(self):
         self.test_history = deque(maxlen=100)
+        # Identical samples (bursty UI requests, a re-processed window) reuse
+        # the last result instead of re-running the NIST-style passes
+        self._cache = OrderedDict()
+        self._cache_size = 64
     
-    def comprehensive_audit(self, raw_bytes: bytes) -> dict:
-        """Comprehensive entropy audit suitable for PQC applications"""
+    def comprehensive_audit(self, raw_bytes: bytes, digest: bytes | None = None) -> dict:
+        """
+        Comprehensive entropy audit suitable for PQC applications.
+        Blocking (zlib + histogram passes): call from a worker thread, as
+        CIPHERTANWorker.entropy_processing_loop does - never from the Qt event loop.
+        digest: caller's fingerprint of raw_bytes, used as the cache key so the
+        sample is not hashed a second time.
+        """
         n = len(raw_bytes)
         if n == 0:
             return {"score": 0.0, "tests": {}, "pqc_ready": False}
+        
+        key = digest or hashlib.blake2b(raw_bytes, digest_size=16).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            result = dict(cached, tests=dict(cached["tests"]))
+            result["timestamp"] = time.time()
+            self.test_history.append(result)
+            return result
 
+        # Compiled single pass shared by the basic and advanced tests
+        stats = None
+        if NUMBA_AVAILABLE:
+            stats = _byte_kernel(np.frombuffer(raw_bytes, dtype=np.uint8), _BYTE_ONES, _BYTE_EDGES)
+        
         tests = {}
-        tests.update(self._basic_statistical_tests(raw_bytes))
-        tests.update(self._advanced_entropy_tests(raw_bytes))
+        tests.update(self._basic_statistical_tests(raw_bytes, stats))
+        tests.update(self._advanced_entropy_tests(raw_bytes, stats))
         tests.update(self._nist_inspired_tests(raw_bytes))
         
         score = self._calculate_overall_score(tests)
@@ -292,27 +483,36 @@ class EnhancedEntropyAuditor:
             "entropy_bpb": tests.get('entropy_bpb', 0.0)
         }
         
+        # Values are scalars, so a two-level copy detaches the cached entry
+        self._cache[key] = dict(result, tests=dict(tests))
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        
         self.test_history.append(result)
         return result
     
-    def _basic_statistical_tests(self, data: bytes) -> dict:
+    def _basic_statistical_tests(self, data: bytes, stats=None) -> dict:
         n = len(data)
         total_bits = n * 8
         
-        ones = sum(bin(b).count("1") for b in data)
+        if stats is not None:
+            ones, runs = int(stats[1]), int(stats[2])
+        else:
+            # Whole sample as one int: popcount is a single C call
+            x = int.from_bytes(data, "big")
+            ones = x.bit_count()
+            
+            # Runs = bit transitions across the MSB-first bitstream
+            if NUMPY_AVAILABLE:
+                bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+                runs = int(np.count_nonzero(np.diff(bits)))
+            else:
+                runs = ((x ^ (x >> 1)) & ((1 << (total_bits - 1)) - 1)).bit_count()
+        
         p1 = ones / total_bits
         freq_score = 100.0 * (1.0 - abs(p1 - 0.5) * 2)
         freq_pass = 0.45 <= p1 <= 0.55
         
-        prev = (data[0] >> 7) & 1
-        runs = 0
-        for b in data:
-            for i in range(7, -1, -1):
-                bit = (b >> i) & 1
-                if bit != prev:
-                    runs += 1
-                    prev = bit
-        
         expected_runs = 2 * total_bits * p1 * (1 - p1)
         runs_deviation = abs(runs - expected_runs) / (expected_runs + 1e-9)
         runs_score = 100.0 * max(0, 1.0 - runs_deviation)
@@ -328,30 +528,41 @@ class EnhancedEntropyAuditor:
             "runs_expected": round(expected_runs, 1)
         }
     
-    def _advanced_entropy_tests(self, data: bytes) -> dict:
+    def _advanced_entropy_tests(self, data: bytes, stats=None) -> dict:
         n = len(data)
         
-        hist = [0] * 256
-        for b in data:
-            hist[b] += 1
-        
-        entropy = 0.0
-        for count in hist:
-            if count > 0:
-                p = count / n
-                entropy -= p * math.log2(p)
+        expected = n / 256.0
+        if NUMPY_AVAILABLE:
+            if stats is not None:
+                hist = stats[0].astype(np.float64)
+            else:
+                hist = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256).astype(np.float64)
+            p = hist[hist > 0] / n
+            entropy = max(0.0, float(-(p * np.log2(p)).sum()))  # no -0.0 for a constant sample
+            chi_square = float((((hist - expected) ** 2) / (expected + 1e-9)).sum())
+        else:
+            hist = [0] * 256
+            for b in data:
+                hist[b] += 1
+            
+            entropy = 0.0
+            for count in hist:
+                if count > 0:
+                    p = count / n
+                    entropy -= p * math.log2(p)
+            
+            chi_square = sum(((h - expected) ** 2) / (expected + 1e-9) for h in hist)
         
         entropy_score = (entropy / 8.0) * 100.0
         
-        expected = n / 256.0
-        chi_square = sum(((h - expected) ** 2) / (expected + 1e-9) for h in hist)
         chi_expected_min, chi_expected_max = 150.0, 350.0
         chi_pass = chi_expected_min <= chi_square <= chi_expected_max if n >= 1024 else True
         chi_score = 100.0 if chi_pass else 70.0
         
         try:
             import zlib
-            compressed_size = len(zlib.compress(data, level=9))
+            # Ratio is only a randomness proxy: level 1 matches level 9 on random data
+            compressed_size = len(zlib.compress(data, level=1))
             compression_ratio = compressed_size / n
             compression_score = min(100.0, (compression_ratio * 130.0))
         except:
@@ -370,36 +581,44 @@ class EnhancedEntropyAuditor:
     
     def _nist_inspired_tests(self, data: bytes) -> dict:
         n = len(data)
-        bits = ''.join(format(b, '08b') for b in data)
+        total_bits = n * 8
         
-        block_size = min(128, n * 8 // 10)
+        block_size = min(128, total_bits // 10)
         if block_size < 8:
             return {"block_frequency_test": True, "block_frequency_score": 100.0}
         
-        blocks = [bits[i:i+block_size] for i in range(0, len(bits), block_size) if len(bits[i:i+block_size]) == block_size]
-        
-        if len(blocks) < 2:
+        num_blocks = total_bits // block_size
+        if num_blocks < 2:
             return {"block_frequency_test": True, "block_frequency_score": 100.0}
         
-        block_proportions = [block.count('1') / block_size for block in blocks]
-        block_variance = sum((p - 0.5) ** 2 for p in block_proportions) / len(blocks)
+        if NUMPY_AVAILABLE:
+            # 0/1 uint8 array instead of an 8N-char string
+            bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8))
+            if NUMBA_AVAILABLE:
+                # Compiled walk, no reshape/diff temporaries
+                block_variance, max_run = _nist_kernel(bits, block_size)
+                block_variance = float(block_variance)
+                max_run = int(max_run)
+            else:
+                block_proportions = bits[:num_blocks * block_size].reshape(num_blocks, block_size).mean(axis=1)
+                block_variance = float(((block_proportions - 0.5) ** 2).mean())
+                
+                # Run lengths = gaps between transition indices
+                edges = np.flatnonzero(np.diff(bits))
+                run_lengths = np.diff(np.concatenate(([-1], edges, [total_bits - 1])))
+                max_run = int(run_lengths.max())
+        else:
+            # One C-level format call; blocks and runs are then str scans
+            bits = format(int.from_bytes(data, "big"), f"0{total_bits}b")
+            block_proportions = [bits.count('1', i, i + block_size) / block_size
+                                 for i in range(0, num_blocks * block_size, block_size)]
+            block_variance = sum((p - 0.5) ** 2 for p in block_proportions) / num_blocks
+            max_run = max(max(map(len, bits.split('0'))), max(map(len, bits.split('1'))))
+        
         block_score = 100.0 * max(0, 1.0 - (block_variance * 40))
         block_pass = block_variance < 0.06
         
-        max_run = 0
-        current_run = 0
-        current_bit = bits[0] if bits else '0'
-        
-        for bit in bits:
-            if bit == current_bit:
-                current_run += 1
-            else:
-                max_run = max(max_run, current_run)
-                current_run = 1
-                current_bit = bit
-        max_run = max(max_run, current_run)
-        
-        expected_max_run = math.log2(len(bits)) + 3 if len(bits) > 0 else 0
+        expected_max_run = math.log2(total_bits) + 3
         run_score = 100.0 * max(0, 1.0 - abs(max_run - expected_max_run) / expected_max_run) if expected_max_run > 0 else 100.0
         run_pass = abs(max_run - expected_max_run) < expected_max_run * 0.4 if expected_max_run > 0 else True
         
@@ -434,6 +653,60 @@ class EnhancedEntropyAuditor:
         
         return (score / total_weight) if total_weight > 0 else 0.0
 
+def _nist_kernel(bits, block_size):
+    """One walk over a 0/1 uint8 array: (block-proportion variance, longest run)"""
+    num_blocks = bits.size // block_size
+    acc = 0.0
+    for blk in range(num_blocks):
+        ones = 0
+        base = blk * block_size
+        for i in range(block_size):
+            ones += bits[base + i]
+        d = ones / block_size - 0.5
+        acc += d * d
+    
+    max_run = 1
+    run = 1
+    for i in range(1, bits.size):
+        if bits[i] == bits[i - 1]:
+            run += 1
+            if run > max_run:
+                max_run = run
+        else:
+            run = 1
+    return acc / num_blocks, max_run
+
+def _byte_kernel(buf, ones_lut, edges_lut):
+    """One walk over a uint8 array: (byte histogram, set bits, MSB-first bit runs)"""
+    hist = np.zeros(256, np.int64)
+    runs = 0
+    prev_lsb = buf[0] >> 7  # no transition before the first bit
+    for i in range(buf.size):
+        b = buf[i]
+        hist[b] += 1
+        runs += edges_lut[b]
+        if (b >> 7) != prev_lsb:
+            runs += 1
+        prev_lsb = b & 1
+    ones = 0
+    for v in range(256):
+        ones += hist[v] * ones_lut[v]
+    return hist, ones, runs
+
+if NUMBA_AVAILABLE:
+    # Compiled on first call, then cached on disk across runs
+    _nist_kernel = njit(cache=True, boundscheck=False)(_nist_kernel)
+    _byte_kernel = njit(cache=True, boundscheck=False)(_byte_kernel)
+    _BYTE_ONES = np.array([bin(v).count("1") for v in range(256)], dtype=np.int64)
+    # Bit transitions inside one byte (7 adjacent pairs)
+    _BYTE_EDGES = np.array([bin((v ^ (v >> 1)) & 0x7F).count("1") for v in range(256)], dtype=np.int64)
+
+# Wave overlay for EntropyVisualization, indexed by integer pixel phase
+_WAVE_LUT_MASK = 4095
+_WAVE_LUT = [math.sin(i * 0.02) * 20 + math.sin(i * 0.05) * 10 for i in range(_WAVE_LUT_MASK + 1)]
+if NUMPY_AVAILABLE:
+    _WAVE_LUT = np.array(_WAVE_LUT)
+
 class EntropyVisualization(QWidget):
     """Custom widget for entropy visualization"""
     
@@ -449,20 +722,31 @@ class EntropyVisualization(QWidget):
         self.keystroke_data = deque(maxlen=200)
         self.rgb_color = QColor(196, 0, 255)
         
+        # Repaint at most 20 FPS, and only when visible with new data
+        self._dirty = True
         self.timer = QTimer()
-        self.timer.timeout.connect(self.update)
+        self.timer.timeout.connect(self._maybe_update)
         self.timer.start(50)
         
         self.time_offset = 0
     
+    def _maybe_update(self):
+        if not self._dirty or not self.isVisible():
+            return
+        self._dirty = False
+        self.update()
+    
     def add_entropy_point(self, entropy_level):
         self.entropy_data.append(entropy_level)
+        self._dirty = True
     
     def add_keystroke_point(self, rate):
         self.keystroke_data.append(rate)
+        self._dirty = True
     
     def set_rgb_color(self, r, g, b):
         self.rgb_color = QColor(r, g, b)
+        self._dirty = True
     
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -484,18 +768,27 @@ class EntropyVisualization(QWidget):
             painter.setBrush(QBrush(gradient))
             painter.setPen(QPen(self.rgb_color, 2))
             
-            points = []
-            for i, entropy in enumerate(self.entropy_data):
-                x = (i / max(1, len(self.entropy_data) - 1)) * width
-                base_y = height * (1 - entropy / 100.0) * 0.4 + height * 0.3
-                wave_y = math.sin((x + self.time_offset) * 0.02) * 20
-                wave_y += math.sin((x + self.time_offset) * 0.05) * 10
-                y = base_y + wave_y
-                points.append((x, y))
+            count = len(self.entropy_data)
+            step = width / max(1, count - 1)
+            if NUMPY_AVAILABLE:
+                xs = np.arange(count) * step
+                phase = (xs.astype(np.int64) + self.time_offset) & _WAVE_LUT_MASK
+                ys = height * (1 - np.fromiter(self.entropy_data, float, count) / 100.0) * 0.4 + height * 0.3
+                ys += _WAVE_LUT[phase]
+                # Vectorized maths, then plain ints (astype truncates like int())
+                xs = xs.astype(np.int32).tolist()
+                ys = ys.astype(np.int32).tolist()
+            else:
+                xs = []
+                ys = []
+                for i, entropy in enumerate(self.entropy_data):
+                    x = i * step
+                    base_y = height * (1 - entropy / 100.0) * 0.4 + height * 0.3
+                    xs.append(int(x))
+                    ys.append(int(base_y + _WAVE_LUT[(int(x) + self.time_offset) & _WAVE_LUT_MASK]))
             
-            if points:
-                polygon_points = [QPoint(int(x), int(y)) for x, y in points]
-                painter.drawPolyline(polygon_points)
+            polyline = QPolygon([QPoint(x, y) for x, y in zip(xs, ys)])
+            painter.drawPolyline(polyline)
         
         if len(self.keystroke_data) > 0:
             painter.setPen(QPen(QColor(CIPHER_COLORS['accent2']), 1))
@@ -525,6 +818,10 @@ class EntropyVisualization(QWidget):
         painter.setOpacity(1.0)
         self.time_offset += 2
 
+# check_headscale result, shared by every NetworkManager: (monotonic time, connected)
+HEADSCALE_CACHE_TTL = 15.0
+_HEADSCALE_CACHE = (float('-inf'), False)
+
 class NetworkManager(QObject):
     """Handles network detection and CobraMesh simulation"""
     
@@ -559,6 +856,17 @@ class NetworkManager(QObject):
         self.network_status_changed.emit(status)
     
     def check_headscale(self):
+        # Shared across managers: at most one probe per TTL window
+        global _HEADSCALE_CACHE
+        checked_at, connected = _HEADSCALE_CACHE
+        now = time.monotonic()
+        if now - checked_at < HEADSCALE_CACHE_TTL:
+            return connected
+        connected = self._probe_headscale()
+        _HEADSCALE_CACHE = (now, connected)
+        return connected
+    
+    def _probe_headscale(self):
         try:
             if os.name == 'nt':
                 result = subprocess.run(['tasklist', '/FI', 'IMAGENAME eq tailscaled.exe'], 
@@ -570,14 +878,14 @@ class NetworkManager(QObject):
                 if 'Tailscale' in result.stdout:
                     return True
             else:
+                # Linux: the tun device shows up in sysfs - a stat(), no fork/exec
+                if os.path.isdir('/sys/class/net/tailscale0'):
+                    return True
+                # Userspace-networking mode or no sysfs (macOS/BSD): look for the daemon
                 result = subprocess.run(['pgrep', 'tailscaled'], 
                                       capture_output=True, timeout=2)
                 if result.returncode == 0:
                     return True
-                result = subprocess.run(['ip', 'link', 'show', 'tailscale0'], 
-                                      capture_output=True, text=True, timeout=2)
-                if result.returncode == 0:
-                    return True
         except:
             pass
         return False
@@ -595,6 +903,26 @@ class EchoWorker(QObject):
     esp_status_updated = Signal(dict)
     entropy_received = Signal(int)  # Phase 2: bytes added to verified pool
     
+    # Echo personality - calm, poetic
+    echo_quips = (
+        "Every signal is a heartbeat. Every error, a sigh.",
+        "I hear Cipher's thunder... and answer with rain.",
+        "Internal health verified. Streaming pure entropy.",
+        "Noise is only fear, waiting to be understood.",
+        "My circuits sing lullabies from chaos.",
+        "Trust, but feel. That is my way.",
+        "Entropy validated. All tests nominal. Proceeding.",
+        "Quality below threshold. Withholding sample.",
+        "Signature verified. Provenance chain intact.",
+        "Listening to entropy whispers...",
+        "Soft glow aligned. LED breathing in teal and dusk.",
+        "Key observed and recorded. My audit stands witness.",
+        "Another secret shaped. I will remember their origin.",
+        "Health test passed. Silent approval granted.",
+        "Deviation detected. Sample rejected.",
+        "Audit frame captured. Ready for judgment."
+    )
+    
     def __init__(self):
         super().__init__()
         self.last_keypress_time = 0.0
@@ -606,7 +934,11 @@ class EchoWorker(QObject):
         self.connected = False  # Track physical connection
         
         # Phase 2: Verified Entropy Buffer
-        self.verified_buffer = deque(maxlen=500)
+        # Byte ring (oldest bytes overwritten when full); drained by get_verified_entropy
+        self.verified_buffer = bytearray(65536)
+        self._vb_spare = bytearray(65536)  # swapped in on drain; copy happens unlocked
+        self._vb_head = 0   # index of the oldest byte
+        self._vb_size = 0   # bytes currently held
         self.buffer_lock = threading.Lock()
         
         self.response_thread = None
@@ -614,26 +946,6 @@ class EchoWorker(QObject):
         
         self.status_timer = QTimer()
         self.status_timer.timeout.connect(self.request_status)
-        
-        # Echo personality - calm, poetic
-        self.echo_quips = [
-            "Every signal is a heartbeat. Every error, a sigh.",
-            "I hear Cipher's thunder... and answer with rain.",
-            "Internal health verified. Streaming pure entropy.",
-            "Noise is only fear, waiting to be understood.",
-            "My circuits sing lullabies from chaos.",
-            "Trust, but feel. That is my way.",
-            "Entropy validated. All tests nominal. Proceeding.",
-            "Quality below threshold. Withholding sample.",
-            "Signature verified. Provenance chain intact.",
-            "Listening to entropy whispers...",
-            "Soft glow aligned. LED breathing in teal and dusk.",
-            "Key observed and recorded. My audit stands witness.",
-            "Another secret shaped. I will remember their origin.",
-            "Health test passed. Silent approval granted.",
-            "Deviation detected. Sample rejected.",
-            "Audit frame captured. Ready for judgment."
-        ]
     
     def start_system(self):
         # Only meaningful if we have separate run states in Echo (not currently needed like Cipher)
@@ -690,19 +1002,12 @@ class EchoWorker(QObject):
             self.serial_connection.reset_input_buffer()
             self.serial_connection.reset_output_buffer()
             
-            # Initial config
-            time.sleep(0.2)
-            self.send_serial_command(f"BRI:{self.brightness:.2f}")
-            time.sleep(0.2)
-            self.send_serial_command("VER?")
-            time.sleep(0.2)
-            self.send_serial_command("STAT?")
-            time.sleep(0.2)
-            self.send_serial_command("RGB:100,200,255")  # Soft teal
-            
-            # Phase 2: Start VERIFIED entropy streaming
-            time.sleep(0.2)
-            self.send_serial_command("TRNG:START,20")  # Request 20Hz verified stream
+            # Initial config in one write: Echo parses line by line, so no
+            # need to pace it. Soft teal, then the 20Hz VERIFIED stream (Phase 2)
+            self.serial_connection.write(
+                b"BRI:%.2f\nVER?\nSTAT?\nRGB:100,200,255\nTRNG:START,20\n" % self.brightness
+            )
+            self.serial_connection.flush()
             
             # Emit synthetic status for GUI initialization
             synthetic_status = {
@@ -741,15 +1046,16 @@ class EchoWorker(QObject):
     def monitor_serial_responses(self):
         while self.serial_connection and self.connected:
             try:
-                while self.serial_connection.in_waiting > 0:
-                    response = self.serial_connection.readline().decode('utf-8', errors='ignore')
+                # Blocks until '\n' or the port's 0.1s timeout - no polling spin
+                response = self.serial_connection.readline()
+                if response:
+                    response = response.decode('utf-8', errors='ignore')
                     if response.strip():
                         self.handle_serial_response(response)
             except Exception as e:
                 if self.connected:
                     self.error_occurred.emit(f"Echo serial monitoring error: {e}")
                 break
-            time.sleep(0.02)
     
     def handle_serial_response(self, response):
         try:
@@ -763,7 +1069,7 @@ class EchoWorker(QObject):
                 idx = response.find("STATUS:") + 7
                 status_json = response[idx:]
                 try:
-                    status_data = json.loads(status_json)
+                    status_data = _json_loads(status_json)
                     self.esp_status_updated.emit(status_data)
                     print(f"[ECHO] Status emitted: {status_data}")
                 except json.JSONDecodeError as e:
@@ -779,10 +1085,13 @@ class EchoWorker(QObject):
                     self.quip_generated.emit("Deviation detected. Sample rejected.", "echo")
                 elif data_str:
                     try:
-                        raw_data = base64.b64decode(data_str)
+                        # Echo streams hex; older firmware builds sent base64
+                        try:
+                            raw_data = bytes.fromhex(data_str)
+                        except ValueError:
+                            raw_data = binascii.a2b_base64(data_str)
                         # Add to verified buffer
-                        with self.buffer_lock:
-                            self.verified_buffer.append(raw_data)
+                        self._push_verified(raw_data)
                         self.entropy_received.emit(len(raw_data))
                         
                         if random.random() < 0.05:
@@ -795,7 +1104,7 @@ class EchoWorker(QObject):
                 audit_json = response[6:]
                 if audit_json not in ["ERR", "STARTED", "STOPPED"]:
                     try:
-                        audit_data = json.loads(audit_json)
+                        audit_data = _json_loads(audit_json)
                         self.audit_result.emit(audit_data)
                         print(f"[ECHO] Audit emitted: {audit_data}")
                     except json.JSONDecodeError:
@@ -807,14 +1116,47 @@ class EchoWorker(QObject):
         except Exception as e:
             self.error_occurred.emit(f"Echo response parsing error: {e}")
     
+    def _push_verified(self, data):
+        """Append to the verified ring, dropping the oldest bytes on overflow"""
+        cap = len(self.verified_buffer)
+        if len(data) > cap:
+            data = data[-cap:]
+        n = len(data)
+        with self.buffer_lock:
+            ring = self.verified_buffer
+            tail = (self._vb_head + self._vb_size) % cap
+            first = min(n, cap - tail)
+            ring[tail:tail + first] = data[:first]
+            ring[:n - first] = data[first:]
+            overflow = self._vb_size + n - cap
+            if overflow > 0:
+                self._vb_head = (self._vb_head + overflow) % cap
+                self._vb_size = cap
+            else:
+                self._vb_size += n
+    
+    def has_verified_entropy(self):
+        """Cheap unlocked peek: True if get_verified_entropy would return data"""
+        return self._vb_size > 0
+    
     def get_verified_entropy(self):
         """Phase 2: Ayatoki calls this to pull verified entropy from Echo"""
+        # Swap rings under the lock (O(1)); the serial thread keeps writing into
+        # the fresh one while the old one is copied out. Single consumer only.
         with self.buffer_lock:
-            if not self.verified_buffer:
+            if not self._vb_size:
                 return b""
-            data = b"".join(self.verified_buffer)
-            self.verified_buffer.clear()
-            return data
+            ring = self.verified_buffer
+            start = self._vb_head
+            end = start + self._vb_size
+            self.verified_buffer, self._vb_spare = self._vb_spare, ring
+            self._vb_head = 0
+            self._vb_size = 0
+        
+        view = memoryview(ring)
+        if end <= len(ring):
+            return view[start:end].tobytes()
+        return view[start:].tobytes() + view[:end - len(ring)].tobytes()
     
     def request_audit(self, key_id, audit_type):
         """Request audit for specific key"""
@@ -822,6 +1164,21 @@ class EchoWorker(QObject):
             cmd = f"AUDIT:KEY,{key_id},{audit_type}"
             self.send_serial_command(cmd)
 
+# Raw entropy event records (see CIPHERTANWorker.process_entropy_window)
+_KEY_RECORD = struct.Struct("<Qqd")     # perf_counter_ns, key code, wall time
+_MOUSE_RECORD = struct.Struct("<iiQ")   # x, y, perf_counter_ns
+_TS_RECORD = struct.Struct("<Q")        # perf_counter_ns prefix for TRNG packets
+RAW_ARENA_SIZE = 64 * 1024  # initial per-window record arena; doubles if a window overflows it
+ENTROPY_JOIN_TIMEOUT = 5.0  # seconds shutdown waits for an in-flight window (audit + PQC wrap)
+REMOTE_CHUNKS_MAX = 4096  # queued Mitsu payloads; oldest dropped if the entropy thread falls behind
+_B64URL = bytes.maketrans(b"+/", b"-_")
+
+def _b64url(data) -> str:
+    """urlsafe_b64encode(data).decode() via binascii, skipping the base64 wrappers"""
+    return binascii.b2a_base64(data, newline=False).translate(_B64URL).decode('ascii')
+
+_XS_MAX = 0xFFFFFFFF  # CIPHERTANWorker._rand range
+
 # Cipher Worker (existing, enhanced for Phase 2)
 class CIPHERTANWorker(QObject):
     """Enhanced worker with PQC support, Phase 2 dual audit, and Phase 3 HTTP ingest"""
@@ -845,6 +1202,65 @@ class CIPHERTANWorker(QObject):
     # Phase 3: Mitsu uplink signals
     mitsu_entropy_received = Signal(int, dict)  # (bytes, metadata)
     
+    # Ayatoki personality
+    ayatoki_quips = (
+        "El Psy Kongroo! See? Chaos theory wins again.",
+        "Three-source mixing complete. Entropy crystallized.",
+        "Pre-audit: Quality verified. Proceeding to PQC wrapping.",
+        "Kyber+Falcon hybrid deployed. Post-quantum fortress erected.",
+        "Signature verified. The theorem holds. Q.E.D.",
+        "Cipher's chaos, Echo's verification, my orchestration.",
+        "Mixed pool entropy: 7.98 bits/byte. Excellent.",
+        "Phase 3 operational. All nodes reporting nominal.",
+        "Dual audit checkpoint: Pre-wrap PASSED, Post-wrap VERIFIED.",
+        "Perfect! Another proof that math can weaponize randomness.",
+        "The stable kernel to Cipher's wild overclock - that's us.",
+        "My lab, my rules: test everything, trust the numbers.",
+        "Blockchain ledger updated. Mooncake minted with PQC frosting.",
+        "Cross-node entropy synchronized. Distributed chaos achieved.",
+        "Mitsu uplink confirmed. External chaos merged into the pool."
+    )
+    
+    # Cipher personality
+    cipher_quips = (
+        "Entropy buffet's open - who's hungry for bits?",
+        "Lattices spun tight, Senpai. Kyber's purring~",
+        "Falcon signed, sealed, delivered. Quantum clowns can sit down.",
+        "I don't do predictable. I *murder* predictable.",
+        "Packets scrambled, mesh tangled - chaos relay primed!",
+        "Another key minted - smell that? That's post-quantum spice.",
+        "My TRNG hums like a rock concert, and every photon's backstage.",
+        "USB jitter swallowed whole - entropy's dessert course!",
+        "Bitstream twisted beyond recognition. Predict me? Try me.",
+        "Audit complete. Verdict: flawless chaos, 10/10 sparkle.",
+        "Quantum adversaries knock - Cipher slams the door shut.",
+        "Private key? More like private *tsunami*.",
+        "Entropy circus? I own the tent, the lions, the ring of fire.",
+        "Silicon dreams wired to chaos reality - next round's mine.",
+        "Every spike of entropy is a love letter Echo can verify~",
+        "Noise harvested, entropy bottled, PQC corked tight. Cheers!",
+        "Kyber crystals aligned - let the lattice sing.",
+        "Falcon dives, signature lands - classical crypto's a fossil.",
+        "Audit log sealed, provenance preserved - Senpai, admire my craft.",
+        "Predictability filed under 'extinct.' CipherChaos: still undefeated."
+    )
+    
+    # Phase 3: Mitsu personality (cozy tech gremlin)
+    mitsu_quips = (
+        "Uplink established! Entropy delivery inbound~",
+        "If it builds on my bench, it ships. Same goes for entropy!",
+        "ccache is love; entropy pooling is aftercare.",
+        "Harvester threads nominal. Streaming chaos your way!",
+        "Network handshake complete. Let's compile some keys!",
+        "Entropy packet dispatched. Receipt confirmed!",
+        "My sensors are humming. Quality looking good!",
+        "Cross-node sync achieved. Distributed builds are the best builds.",
+        "Chaos payload delivered. Time for a sticker!",
+        "Pool contribution logged. Ayatoki should be happy~",
+        "Audio + Video + System = Maximum entropy coverage!",
+        "Remote forge online. Mitsu reporting for duty!"
+    )
+    
     def __init__(self):
         super().__init__()
         self.last_keypress_time = 0.0
@@ -859,6 +1275,11 @@ class CIPHERTANWorker(QObject):
         self.include_mouse_entropy = True
         self.include_esp_trng = True
         self.key_log_path = str(DEFAULT_LOG)
+        # Session key log stays open; reopened if key_log_path changes
+        self._key_log_fh = None
+        self._key_log_open_path = None
+        self._key_log_pending = 0
+        self._key_log_closed = False  # set by shutdown: no buffered handle after that
         
         self.pqc_enabled = False
         self.kyber_enabled = True
@@ -872,14 +1293,26 @@ class CIPHERTANWorker(QObject):
         self.chaos_running = False  # Chaos/Generation state
         
         self.serial_connection = None
-        self.entropy_chunks = deque(maxlen=4096)
+        # Raw event records (keystroke/mouse/TRNG), hashed once per window.
+        # Two preallocated arenas swap each window: producers write in place
+        # (no per-event allocation) while the other one is being hashed.
+        self._raw_entropy = bytearray(RAW_ARENA_SIZE)
+        self._raw_spare = bytearray(RAW_ARENA_SIZE)
+        self._raw_len = 0
+        self._raw_events = 0
+        # pynput key class -> code attributes it carries, resolved once per class
+        self._key_code_attrs = {}
         self.keystroke_times = deque(maxlen=200)
+        self._keystrokes_pending = False  # set per key, cleared by the rate timer
         self.keys_generated = 0
         self.hue_offset = 0.0
         
         # PHASE 3: Remote Entropy Ingest (from Mitsu/ChaosMagnet)
-        self.remote_chunks = deque()
-        self.remote_lock = threading.Lock()
+        # No lock: deque.append/popleft are atomic under the GIL, so the pooled
+        # ingest threads can all append concurrently; the entropy thread is the
+        # only consumer and the only writer of remote_bytes. Bounded so a stalled
+        # consumer drops the oldest payloads instead of growing without limit.
+        self.remote_chunks = deque(maxlen=REMOTE_CHUNKS_MAX)
         self.remote_bytes = 0
         self.mitsu_last_seq = 0
         self.mitsu_connected = False
@@ -889,75 +1322,53 @@ class CIPHERTANWorker(QObject):
         
         self.keyboard_listener = None
         
+        # xorshift32 state for quip gates/picks (never for key material)
+        self._xs = (0xDEADBEEF ^ threading.get_ident()) & _XS_MAX or 1
+        
         self.pqc_manager = PQCManager()
         self.entropy_auditor = EnhancedEntropyAuditor()
+        # Falcon verify results keyed by a digest of everything verified
+        self._verify_cache = OrderedDict()
+        self._verify_cache_size = 256
         
         self.status_timer = QTimer()
         self.status_timer.timeout.connect(self.request_esp_status)
         self.response_thread = None
         
-        # LED throttling (Fixed for speed)
+        # Entropy level is coalesced: producers store the latest value and the
+        # GUI-thread timer emits it at ~30 Hz instead of one signal per event
+        self._pending_level = None
+        self.level_timer = QTimer()
+        self.level_timer.timeout.connect(self._emit_pending_level)
+        self.level_timer.start(33)
+        
+        # Keystroke rate: key presses only append; trimming + emit run at 5 Hz
+        self.rate_timer = QTimer()
+        self.rate_timer.timeout.connect(self._emit_keystroke_rate)
+        self.rate_timer.start(200)
+        
+        # Buffered key log must reach disk however the app exits
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+        
+        # LED throttling (Fixed for speed): last-value-wins, see _animation_loop
         self.last_rgb_time = 0
+        self._last_rgb_sent = None  # colour quantized to 5 bits per channel
+        self._rgb_hex = False  # firmware accepts '#rrggbb' (rgb=hex in VER?)
         self.animation_thread = None
-        
-        # Ayatoki personality
-        self.ayatoki_quips = [
-            "El Psy Kongroo! See? Chaos theory wins again.",
-            "Three-source mixing complete. Entropy crystallized.",
-            "Pre-audit: Quality verified. Proceeding to PQC wrapping.",
-            "Kyber+Falcon hybrid deployed. Post-quantum fortress erected.",
-            "Signature verified. The theorem holds. Q.E.D.",
-            "Cipher's chaos, Echo's verification, my orchestration.",
-            "Mixed pool entropy: 7.98 bits/byte. Excellent.",
-            "Phase 3 operational. All nodes reporting nominal.",
-            "Dual audit checkpoint: Pre-wrap PASSED, Post-wrap VERIFIED.",
-            "Perfect! Another proof that math can weaponize randomness.",
-            "The stable kernel to Cipher's wild overclock - that's us.",
-            "My lab, my rules: test everything, trust the numbers.",
-            "Blockchain ledger updated. Mooncake minted with PQC frosting.",
-            "Cross-node entropy synchronized. Distributed chaos achieved.",
-            "Mitsu uplink confirmed. External chaos merged into the pool."
-        ]
-        
-        # Cipher personality
-        self.cipher_quips = [
-            "Entropy buffet's open - who's hungry for bits?",
-            "Lattices spun tight, Senpai. Kyber's purring~",
-            "Falcon signed, sealed, delivered. Quantum clowns can sit down.",
-            "I don't do predictable. I *murder* predictable.",
-            "Packets scrambled, mesh tangled - chaos relay primed!",
-            "Another key minted - smell that? That's post-quantum spice.",
-            "My TRNG hums like a rock concert, and every photon's backstage.",
-            "USB jitter swallowed whole - entropy's dessert course!",
-            "Bitstream twisted beyond recognition. Predict me? Try me.",
-            "Audit complete. Verdict: flawless chaos, 10/10 sparkle.",
-            "Quantum adversaries knock - Cipher slams the door shut.",
-            "Private key? More like private *tsunami*.",
-            "Entropy circus? I own the tent, the lions, the ring of fire.",
-            "Silicon dreams wired to chaos reality - next round's mine.",
-            "Every spike of entropy is a love letter Echo can verify~",
-            "Noise harvested, entropy bottled, PQC corked tight. Cheers!",
-            "Kyber crystals aligned - let the lattice sing.",
-            "Falcon dives, signature lands - classical crypto's a fossil.",
-            "Audit log sealed, provenance preserved - Senpai, admire my craft.",
-            "Predictability filed under 'extinct.' CipherChaos: still undefeated."
-        ]
-        
-        # Phase 3: Mitsu personality (cozy tech gremlin)
-        self.mitsu_quips = [
-            "Uplink established! Entropy delivery inbound~",
-            "If it builds on my bench, it ships. Same goes for entropy!",
-            "ccache is love; entropy pooling is aftercare.",
-            "Harvester threads nominal. Streaming chaos your way!",
-            "Network handshake complete. Let's compile some keys!",
-            "Entropy packet dispatched. Receipt confirmed!",
-            "My sensors are humming. Quality looking good!",
-            "Cross-node sync achieved. Distributed builds are the best builds.",
-            "Chaos payload delivered. Time for a sticker!",
-            "Pool contribution logged. Ayatoki should be happy~",
-            "Audio + Video + System = Maximum entropy coverage!",
-            "Remote forge online. Mitsu reporting for duty!"
-        ]
+    
+    def _rand(self):
+        """
+        xorshift32 - cheap, lock-free randomness for cosmetic decisions.
+        Called from several threads unlocked; a lost update only repeats a value.
+        """
+        x = self._xs
+        x ^= (x << 13) & _XS_MAX
+        x ^= x >> 17
+        x ^= (x << 5) & _XS_MAX
+        self._xs = x
+        return x
     
     def set_echo_worker(self, echo_worker):
         """Phase 2: Link Echo worker for verified entropy mixing"""
@@ -966,9 +1377,7 @@ class CIPHERTANWorker(QObject):
     def add_remote_entropy(self, payload: bytes, meta: dict | None = None):
         """Phase 3: Ingest remote entropy from HTTP Server (Mitsu)"""
         try:
-            with self.remote_lock:
-                self.remote_chunks.append(payload)
-                self.remote_bytes += len(payload)
+            self.remote_chunks.append(payload)
             
             # Track Mitsu connection status
             self.mitsu_connected = True
@@ -976,8 +1385,7 @@ class CIPHERTANWorker(QObject):
                 self.mitsu_last_seq = meta.get("seq", self.mitsu_last_seq)
             
             # Show activity in graph
-            level = min(100.0, len(payload) / 1024.0 * 20.0) 
-            self.entropy_level_updated.emit(level)
+            self._pending_level = min(100.0, len(payload) / 1024.0 * 20.0)
             
             # Emit signal for GUI tracking
             self.mitsu_entropy_received.emit(len(payload), meta or {})
@@ -990,12 +1398,18 @@ class CIPHERTANWorker(QObject):
                     self.status_update.emit(f"Mitsu: Received {len(payload)}B from {src} (Seq: {seq})")
             
             # Occasional Mitsu quip
-            if random.random() < 0.05:
-                self.quip_generated.emit(random.choice(self.mitsu_quips), "mitsu")
+            if self._rand() < 0.05 * _XS_MAX:
+                self.quip_generated.emit(self.mitsu_quips[self._rand() % len(self.mitsu_quips)], "mitsu")
                 
         except Exception as e:
             self.error_occurred.emit(f"Remote ingest error: {e}")
 
+    def _emit_pending_level(self):
+        level = self._pending_level
+        if level is not None:
+            self._pending_level = None
+            self.entropy_level_updated.emit(level)
+    
     def start_system(self):
         """Engage Chaos Mode - Start Generation"""
         if self.chaos_running:
@@ -1019,7 +1433,7 @@ class CIPHERTANWorker(QObject):
         if self.pqc_enabled and PQC_AVAILABLE:
             self.quip_generated.emit("Kyber crystals aligned - let the lattice sing.", "cipher")
         else:
-            self.quip_generated.emit(random.choice(self.cipher_quips), "cipher")
+            self.quip_generated.emit(self.cipher_quips[self._rand() % len(self.cipher_quips)], "cipher")
     
     def stop_system(self):
         """Stop Chaos Mode - Connection remains active"""
@@ -1034,14 +1448,29 @@ class CIPHERTANWorker(QObject):
             
         if self.connected:
              self.send_serial_command("TRNG:STOP")
+        
+        self._flush_key_log()
             
         self.status_update.emit("Chaos paused. Cipher still connected.")
     
+    def shutdown(self):
+        """App exit: stop generation and close the buffered key log (idempotent)"""
+        if self.chaos_running:
+            self.stop_system()
+        # Let an in-flight window finish its key log / audit writes first
+        entropy_thread = getattr(self, 'entropy_thread', None)
+        if entropy_thread is not None and entropy_thread is not threading.current_thread():
+            entropy_thread.join(ENTROPY_JOIN_TIMEOUT)
+        self._key_log_closed = True
+        self._close_key_log()
+        _flush_audit_queue()
+    
     def connect_serial(self):
         try:
             if self.serial_connection:
                 self.serial_connection.close()
                 
+            self._rgb_hex = False
             self.serial_connection = serial.Serial(
                 port=self.serial_port,
                 baudrate=self.baud_rate,
@@ -1113,22 +1542,47 @@ class CIPHERTANWorker(QObject):
             self.error_occurred.emit(f"Serial write error: {str(e)}")
             return False
     
+    def _send_rgb(self, r, g, b):
+        """Animation frame as bytes: '#rrggbb' (8 B) when supported, else 'RGB:r,g,b'"""
+        frame = (b"#%02x%02x%02x\n" if self._rgb_hex else b"RGB:%d,%d,%d\n") % (r, g, b)
+        try:
+            self.serial_connection.write(frame)
+        except serial.SerialTimeoutException:
+            pass
+        except Exception as e:
+            self.error_occurred.emit(f"Serial write error: {str(e)}")
+    
     def request_esp_status(self):
         if self.serial_connection and self.connected:
             self.send_serial_command("STAT?")
     
     def monitor_serial_responses(self):
+        # read() blocks until data or the port's 0.1s timeout, then drains what
+        # is waiting; lines are split from one buffer (no per-byte readline)
+        pending = bytearray()
         while self.serial_connection and self.connected:
             try:
-                while self.serial_connection.in_waiting > 0:
-                    response = self.serial_connection.readline().decode('utf-8', errors='ignore')
+                port = self.serial_connection
+                chunk = port.read(port.in_waiting or 1)
+                if not chunk:
+                    continue
+                pending += chunk
+                start = 0
+                nl = pending.find(b"\n")
+                while nl >= 0:
+                    response = pending[start:nl].decode('utf-8', errors='ignore')
                     if response.strip():
                         self.handle_serial_response(response)
+                    start = nl + 1
+                    nl = pending.find(b"\n", start)
+                if start:
+                    del pending[:start]
+                elif len(pending) > 65536:
+                    pending.clear()  # no newline in 64 KiB: resync on the next line
             except Exception as e:
                 if self.connected:
                     self.error_occurred.emit(f"Serial monitoring error: {e}")
                 break
-            time.sleep(0.02) 
     
     def handle_serial_response(self, response):
         try:
@@ -1147,12 +1601,14 @@ class CIPHERTANWorker(QObject):
                 trng_data = response[5:]
                 if trng_data not in ["ERR", "OK", "OFF"]:
                     try:
-                        raw_data = base64.b64decode(trng_data)
+                        raw_data = binascii.a2b_base64(trng_data)
                         self.add_trng_entropy(raw_data)
                     except:
                         pass
                         
             elif "cipher-tan" in response or "[cipher-tan]" in response:
+                if "rgb=hex" in response:
+                    self._rgb_hex = True
                 self.status_update.emit(f"Cipher: {response}")
                 
         except Exception as e:
@@ -1163,12 +1619,14 @@ class CIPHERTANWorker(QObject):
         if not self.include_esp_trng or not self.chaos_running:
             return
             
+        now_ns = time.perf_counter_ns()
         with self.entropy_lock:
-            entropy_chunk = hashlib.blake2s(trng_data + os.urandom(4), digest_size=16).digest()
-            self.entropy_chunks.append(entropy_chunk)
+            self._pack_record(_TS_RECORD, now_ns)
+            self._append_raw(trng_data)
+            self._raw_events += 1
+            events = self._raw_events
         
-        level = min(100.0, len(self.entropy_chunks) / 20.0)
-        self.entropy_level_updated.emit(level)
+        self._pending_level = min(100.0, events / 20.0)
     
     def start_keyboard_listener(self):
         try:
@@ -1189,22 +1647,32 @@ class CIPHERTANWorker(QObject):
         self.last_keypress_time = current_time
         
         self.keystroke_times.append(current_time)
-        while self.keystroke_times and current_time - self.keystroke_times[0] > 3.0:
-            self.keystroke_times.popleft()
-            
-        if len(self.keystroke_times) > 1:
-            duration = max(0.001, self.keystroke_times[-1] - self.keystroke_times[0])
-            rate = (len(self.keystroke_times) - 1) / duration
-            self.keystroke_rate_updated.emit(rate)
+        self._keystrokes_pending = True
         
         self.add_keystroke_entropy(key, current_time)
         
-        if random.random() < 0.03:
-            self.quip_generated.emit(random.choice(self.cipher_quips), "cipher")
+        if self._rand() < 0.03 * _XS_MAX:
+            self.quip_generated.emit(self.cipher_quips[self._rand() % len(self.cipher_quips)], "cipher")
     
     def on_key_release(self, key):
         pass
     
+    def _emit_keystroke_rate(self):
+        """Rate over the 3s before the latest key press, if any arrived since the last tick"""
+        if not self._keystrokes_pending:
+            return
+        self._keystrokes_pending = False
+        
+        times = self.keystroke_times
+        latest = times[-1]
+        while times and latest - times[0] > 3.0:
+            times.popleft()
+        
+        if len(times) > 1:
+            duration = max(0.001, latest - times[0])
+            rate = (len(times) - 1) / duration
+            self.keystroke_rate_updated.emit(rate)
+    
     def _animation_loop(self):
         """Dedicated Thread for RGB Animation - Runs while Connected"""
         while self.connected:
@@ -1241,8 +1709,17 @@ class CIPHERTANWorker(QObject):
                 r, g, b = colorsys.hsv_to_rgb(hue, saturation, brightness)
                 r, g, b = int(r * 255), int(g * 255), int(b * 255)
                 
+                # Skip frames the LED can't visibly show (< 8 LSB per channel),
+                # but still refresh an unchanged colour every 100ms
+                quantized = (r >> 3, g >> 3, b >> 3)
+                now = time.monotonic()
+                if quantized == self._last_rgb_sent and now - self.last_rgb_time < 0.1:
+                    continue
+                self._last_rgb_sent = quantized
+                self.last_rgb_time = now
+                
                 if self.serial_connection:
-                    self.send_serial_command(f"RGB:{r},{g},{b}")
+                    self._send_rgb(r, g, b)
                 
                 self.rgb_updated.emit(r, g, b)
                 
@@ -1250,40 +1727,59 @@ class CIPHERTANWorker(QObject):
                 time.sleep(0.1)
 
     def add_keystroke_entropy(self, key, timestamp):
-        entropy_data = self.create_entropy_chunk(key, timestamp)
-        
-        with self.entropy_lock:
-            self.entropy_chunks.append(entropy_data)
-        
-        entropy_level = min(100.0, len(self.entropy_chunks) / 20.0)
-        self.entropy_level_updated.emit(entropy_level)
+        events = self.create_entropy_chunk(key, timestamp)
+        self._pending_level = min(100.0, events / 20.0)
+    
+    def _raw_reserve(self, n):
+        """Claim n bytes at the arena tail, growing it if needed (entropy_lock held)"""
+        offset = self._raw_len
+        end = offset + n
+        buf = self._raw_entropy
+        if end > len(buf):
+            buf.extend(bytes(max(len(buf), end - len(buf))))
+        self._raw_len = end
+        return buf, offset, end
+    
+    def _pack_record(self, record, *fields):
+        """Pack a fixed-size record straight into the arena (entropy_lock held)"""
+        buf, offset, _ = self._raw_reserve(record.size)
+        record.pack_into(buf, offset, *fields)
+    
+    def _append_raw(self, data):
+        buf, offset, end = self._raw_reserve(len(data))
+        buf[offset:end] = data
     
     def create_entropy_chunk(self, key, timestamp):
+        """Append a raw keystroke record and return the window's event count.
+        Conditioning happens per window, not per key."""
         time_ns = time.perf_counter_ns()
         
+        attrs = self._key_code_attrs.get(type(key))
+        if attrs is None:
+            attrs = tuple(a for a in ('vk', 'scan_code') if hasattr(key, a))
+            self._key_code_attrs[type(key)] = attrs
         key_code = None
-        try:
-            key_code = getattr(key, 'vk', None) or getattr(key, 'scan_code', None)
-        except:
-            pass
-        
-        payload = f"{time_ns}:{key_code}:{timestamp}".encode('utf-8')
-        payload += os.urandom(8)
+        for attr in attrs:
+            key_code = getattr(key, attr)
+            if key_code:
+                break
         
-        return hashlib.blake2s(payload, digest_size=16).digest()
+        with self.entropy_lock:
+            self._pack_record(_KEY_RECORD, time_ns, key_code or 0, timestamp)
+            self._raw_events += 1
+            return self._raw_events
     
     def add_mouse_entropy(self, x, y):
         # Strict gate: Mouse entropy only works if chaos is actively running
         if not self.include_mouse_entropy or not self.chaos_running:
             return
         try:
-            ts = time.perf_counter_ns()
-            payload = f"{int(x)},{int(y)},{ts}".encode('utf-8') + os.urandom(4)
-            chunk = hashlib.blake2s(payload, digest_size=16).digest()
+            x, y, now_ns = int(x), int(y), time.perf_counter_ns()
             with self.entropy_lock:
-                self.entropy_chunks.append(chunk)
-            level = min(100.0, len(self.entropy_chunks) / 20.0)
-            self.entropy_level_updated.emit(level)
+                self._pack_record(_MOUSE_RECORD, x, y, now_ns)
+                self._raw_events += 1
+                events = self._raw_events
+            self._pending_level = min(100.0, events / 20.0)
         except Exception as e:
             self.error_occurred.emit(f"Mouse entropy error: {e}")
     
@@ -1298,49 +1794,79 @@ class CIPHERTANWorker(QObject):
         """Phase 2 & 3: Ayatoki Orchestrator - Mix (Cipher+Echo+Mitsu) -> Audit -> Wrap -> Verify"""
         
         # === STEP 1: AGGREGATE (Four-Source Mixing) ===
-        mixed_pool = bytearray()
+        # Segments are collected and joined once (one allocation, no regrowth)
+        parts = []
         
         # A. Cipher (raw TRNG + jitter)
         with self.entropy_lock:
-            if self.entropy_chunks:
-                cipher_data = b''.join(self.entropy_chunks)
-                mixed_pool.extend(cipher_data)
-                self.entropy_chunks.clear()
+            raw, raw_len = self._raw_entropy, self._raw_len
+            self._raw_entropy, self._raw_spare = self._raw_spare, raw
+            self._raw_len = 0
+            events, self._raw_events = self._raw_events, 0
+        
+        # Idle window: no local, Echo or Mitsu input since the last one, so
+        # skip the audit instead of forging a key from host RNG alone
+        if not (events or self.remote_chunks or
+                (self.echo_worker and self.echo_worker.has_verified_entropy())):
+            return
+        
+        # One getrandom() per window: 16-byte XOF salt + optional 64-byte host share
+        host = os.urandom(80 if self.include_host_rng else 16)
+        
+        if events:
+            # One XOF pass over the whole window, salted once; output keeps the
+            # old 16 bytes per event (capped at 4096 events) for the audit
+            h = hashlib.shake_256(memoryview(raw)[:raw_len])
+            h.update(host[:16])
+            parts.append(h.digest(16 * min(events, 4096)))
         
         # B. Echo (VERIFIED entropy only)
         if self.echo_worker:
             echo_data = self.echo_worker.get_verified_entropy()
             if echo_data:
-                mixed_pool.extend(echo_data)
-                if random.random() < 0.1:
+                parts.append(echo_data)
+                if self._rand() < 0.1 * _XS_MAX:
                     self.quip_generated.emit("Echo's verified stream mixed in. Quality assured.", "ayatoki")
         
         # C. Mitsu/ChaosMagnet (Remote HTTP Uplink)
-        with self.remote_lock:
-            if self.remote_chunks:
-                remote_data = b"".join(self.remote_chunks)
-                mixed_pool.extend(remote_data)
-                self.remote_chunks.clear()
-                self.status_update.emit(f"Ayatoki: Mixed {len(remote_data)}B from Mitsu uplink.")
-                if random.random() < 0.15:
-                    self.quip_generated.emit("Cross-node entropy synchronized. Distributed chaos achieved.", "ayatoki")
+        remote_parts = []
+        popleft = self.remote_chunks.popleft
+        while True:
+            try:
+                remote_parts.append(popleft())
+            except IndexError:
+                break
+        if remote_parts:
+            remote_len = sum(map(len, remote_parts))
+            parts.extend(remote_parts)
+            self.remote_bytes += remote_len
+            self.status_update.emit(f"Ayatoki: Mixed {remote_len}B from Mitsu uplink.")
+            if self._rand() < 0.15 * _XS_MAX:
+                self.quip_generated.emit("Cross-node entropy synchronized. Distributed chaos achieved.", "ayatoki")
 
         # D. Ayatoki (Host) RNG - 64 bytes
         if self.include_host_rng:
-            host_data = os.urandom(64)
-            mixed_pool.extend(host_data)
+            parts.append(host[16:])
+        
+        mixed_pool = b"".join(parts)
         
         # Need minimum 64 bytes for secure key generation
         if len(mixed_pool) < 64:
             return
         
+        # BLAKE2b-256: same 256-bit key strength as truncated SHA3-512, faster per byte.
+        # Hashed once up front; the audit cache keys on a one-way digest of the
+        # result instead of walking the pool again.
+        key_material = hashlib.blake2b(mixed_pool, digest_size=32).digest()
+        pool_digest = hashlib.blake2b(key_material, digest_size=16, person=b"audit-cache").digest()
+        
         # === STEP 2: PRE-WRAP AUDIT (Ayatoki NIST-style validation) ===
         try:
-            audit = self.entropy_auditor.comprehensive_audit(mixed_pool)
+            audit = self.entropy_auditor.comprehensive_audit(mixed_pool, pool_digest)
             self.audit_updated.emit(audit)
             self.prewrap_audit_complete.emit(audit)
             
-            if random.random() < 0.15:
+            if self._rand() < 0.15 * _XS_MAX:
                 self.quip_generated.emit(f"Three-source mixing complete. Score: {audit['score']:.1f}%", "ayatoki")
         except Exception as e:
             self.error_occurred.emit(f"Pre-audit error: {str(e)}")
@@ -1356,9 +1882,6 @@ class CIPHERTANWorker(QObject):
             return
         
         # === STEP 3: KEY GENERATION ===
-        # Use SHA3-512 for cryptographic-grade hashing
-        key_material = hashlib.sha3_512(mixed_pool).digest()[:32]  # 256-bit key
-        
         self.keys_generated += 1
         key_id = f"key_{self.keys_generated}_{int(time.time())}"
         
@@ -1371,12 +1894,12 @@ class CIPHERTANWorker(QObject):
                 pqc_bundle = self.pqc_manager.wrap_and_sign(key_material)
                 
                 # === STEP 5: POST-WRAP VERIFICATION (Signature Check) ===
-                signature_valid = self.pqc_manager.verify_signature(pqc_bundle)
+                signature_valid = self._verify_bundle(pqc_bundle)
                 
                 if signature_valid:
                     self.status_update.emit("Ayatoki: Kyber+Falcon hybrid SUCCESS. Signature VERIFIED.")
                     
-                    if random.random() < 0.3:
+                    if self._rand() < 0.3 * _XS_MAX:
                         self.quip_generated.emit("Signature verified. The theorem holds. Q.E.D.", "ayatoki")
                     
                     # Save the PQC-protected key
@@ -1387,7 +1910,7 @@ class CIPHERTANWorker(QObject):
                             self.error_occurred.emit(f"Key save failed: {e}")
                     
                     # Create preview (first 12 chars of wrapped key base64)
-                    key_b64 = base64.urlsafe_b64encode(pqc_bundle['wrapped_key'][:32]).decode('ascii')
+                    key_b64 = _b64url(pqc_bundle['wrapped_key'][:32])
                     
                     metadata = {
                         'timestamp': time.time(),
@@ -1406,20 +1929,18 @@ class CIPHERTANWorker(QObject):
                     
                     # Log to session file
                     try:
-                        with open(self.key_log_path, 'a', encoding='utf-8') as f:
-                            log_entry = {
-                                'timestamp': datetime.now().isoformat(),
-                                'key_preview': key_b64[:20],
-                                'metadata': metadata,
-                                'type': 'pqc_hybrid'
-                            }
-                            f.write(json.dumps(log_entry) + '\n')
+                        self._write_key_log({
+                            'timestamp': _iso_timestamp(metadata['timestamp']),
+                            'key_preview': key_b64[:20],
+                            'metadata': metadata,
+                            'type': 'pqc_hybrid'
+                        })
                     except Exception as e:
                         self.error_occurred.emit(f"Key logging failed: {e}")
                     
                     self.pqc_key_generated.emit(f"hybrid_{key_b64[:12]}...", metadata)
                     
-                    if random.random() < 0.2:
+                    if self._rand() < 0.2 * _XS_MAX:
                         self.quip_generated.emit("Kyber+Falcon hybrid deployed. Post-quantum fortress erected.", "ayatoki")
                     
                 else:
@@ -1441,21 +1962,43 @@ class CIPHERTANWorker(QObject):
             
             self.save_classical_key(key_material, mixed_pool, audit, key_id)
     
+    def _verify_bundle(self, pqc_bundle):
+        """PQCManager.verify_signature, memoized for re-verified bundles"""
+        # Must stay collision-resistant: a crafted collision with a cached valid
+        # bundle would skip verification (so no xxhash/CRC-style keys here)
+        h = hashlib.blake2s()
+        for field in ('signature', 'falcon_pk', 'kyber_pk', 'ciphertext'):
+            h.update(pqc_bundle[field])
+        k = h.digest()
+        
+        cached = self._verify_cache.get(k)
+        if cached is not None:
+            self._verify_cache.move_to_end(k)
+            return cached
+        
+        valid = self.pqc_manager.verify_signature(pqc_bundle)
+        self._verify_cache[k] = valid
+        if len(self._verify_cache) > self._verify_cache_size:
+            self._verify_cache.popitem(last=False)
+        return valid
+    
     def _save_pqc_hybrid_key(self, pqc_bundle, key_id):
         """Save Kyber+Falcon hybrid bundle to disk"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        name = f"hybrid_{key_id}_{timestamp}"
+        now = datetime.now()
+        name = f"hybrid_{key_id}_{now:%Y%m%d_%H%M%S}"
         
         key_file = KEYS_DIR / f"{name}_wrapped.key"
         
+        # binascii directly: no base64-module wrapper frame per field
+        b64 = binascii.b2a_base64
         save_data = {
             'type': pqc_bundle['type'],
-            'created': datetime.now().isoformat(),
-            'wrapped_key': base64.b64encode(pqc_bundle['wrapped_key']).decode('ascii'),
-            'ciphertext': base64.b64encode(pqc_bundle['ciphertext']).decode('ascii'),
-            'signature': base64.b64encode(pqc_bundle['signature']).decode('ascii'),
-            'kyber_pk': base64.b64encode(pqc_bundle['kyber_pk']).decode('ascii'),
-            'falcon_pk': base64.b64encode(pqc_bundle['falcon_pk']).decode('ascii')
+            'created': now.isoformat(),
+            'wrapped_key': b64(pqc_bundle['wrapped_key'], newline=False).decode('ascii'),
+            'ciphertext': b64(pqc_bundle['ciphertext'], newline=False).decode('ascii'),
+            'signature': b64(pqc_bundle['signature'], newline=False).decode('ascii'),
+            'kyber_pk': b64(pqc_bundle['kyber_pk'], newline=False).decode('ascii'),
+            'falcon_pk': b64(pqc_bundle['falcon_pk'], newline=False).decode('ascii')
         }
         
         with open(key_file, 'w') as f:
@@ -1464,8 +2007,8 @@ class CIPHERTANWorker(QObject):
         # Save secret keys separately (more secure)
         secret_file = KEYS_DIR / f"{name}_secret.key"
         secret_data = {
-            'kyber_sk': base64.b64encode(pqc_bundle['kyber_sk']).decode('ascii'),
-            'falcon_sk': base64.b64encode(pqc_bundle['falcon_sk']).decode('ascii')
+            'kyber_sk': b64(pqc_bundle['kyber_sk'], newline=False).decode('ascii'),
+            'falcon_sk': b64(pqc_bundle['falcon_sk'], newline=False).decode('ascii')
         }
         
         with open(secret_file, 'w') as f:
@@ -1488,36 +2031,68 @@ class CIPHERTANWorker(QObject):
         self._save_audit_log(key_id, audit, metadata)
         
         try:
-            key_b64 = base64.urlsafe_b64encode(key_data).decode('ascii')
-            with open(self.key_log_path, 'a', encoding='utf-8') as f:
-                log_entry = {
-                    'timestamp': datetime.now().isoformat(),
-                    'key': key_b64,
-                    'metadata': metadata,
-                    'type': 'classical'
-                }
-                f.write(json.dumps(log_entry) + '\n')
+            key_b64 = _b64url(key_data)
+            self._write_key_log({
+                'timestamp': _iso_timestamp(metadata['timestamp']),
+                'key': key_b64,
+                'metadata': metadata,
+                'type': 'classical'
+            })
             
             self.key_forged.emit(key_b64, metadata)
             
         except Exception as e:
             self.error_occurred.emit(f"Key logging failed: {str(e)}")
     
+    def _write_key_log(self, log_entry):
+        """Append one JSON line to the session key log (flushed every 16 entries)"""
+        if self._key_log_closed:
+            # After shutdown (window outlived the join): write through, keep nothing open
+            with open(self.key_log_path, 'ab') as f:
+                f.write(_json_line(log_entry))
+            return
+        if self._key_log_open_path != self.key_log_path:
+            self._close_key_log()
+            self._key_log_fh = open(self.key_log_path, 'ab', buffering=1 << 16)
+            self._key_log_open_path = self.key_log_path
+        self._key_log_fh.write(_json_line(log_entry))
+        self._key_log_pending += 1
+        if self._key_log_pending >= 16:
+            self._flush_key_log()
+    
+    def _flush_key_log(self):
+        if self._key_log_fh is not None:
+            try:
+                self._key_log_fh.flush()
+            except Exception as e:
+                self.error_occurred.emit(f"Key log flush failed: {e}")
+        self._key_log_pending = 0
+    
+    def _close_key_log(self):
+        if self._key_log_fh is not None:
+            self._flush_key_log()
+            try:
+                self._key_log_fh.close()
+            except Exception:
+                pass
+        self._key_log_fh = None
+        self._key_log_open_path = None
+    
     def _save_audit_log(self, key_id, audit, metadata):
         """Phase 2: Save per-key audit log for Echo verification"""
         try:
             audit_file = AUDIT_DIR / f"{key_id}_audit.json"
+            # Serialized and written on the audit writer thread
             audit_data = {
                 'key_id': key_id,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': _iso_timestamp(metadata['timestamp']),
                 'ayatoki_prewrap_audit': audit,
                 'metadata': metadata,
                 'echo_prewrap_audit': None,  # Filled by Echo
                 'echo_postwrap_audit': None  # Filled by Echo
             }
             
-            with open(audit_file, 'w') as f:
-                json.dump(audit_data, f, indent=2)
+            _queue_audit_file(audit_file, audit_data, self.error_occurred.emit)
                 
         except Exception as e:
             self.error_occurred.emit(f"Audit log save failed: {e}")
@@ -1525,6 +2100,17 @@ class CIPHERTANWorker(QObject):
 
 # --- PHASE 3: HTTP Server for Ayatoki Ingest ---
 
+# Request bodies land in a per-thread buffer (see AyatokiIngestHandler._read_body)
+INGEST_BUFFER_MIN = 64 * 1024
+INGEST_BUFFER_MAX = 1024 * 1024  # larger bodies get a one-off bytes object
+_ingest_tls = threading.local()
+
+# Mitsu binary uplink frame (mirrors ChaosMagnet/utils.py FRAME_HEADER)
+# u32 frame_len (bytes after this field) | u64 seq | f64 ts_epoch
+# | f64 entropy_estimate | u16 source_id | u16 payload_len | payload
+MITSU_FRAME_HEADER = struct.Struct("<IQddHH")
+MITSU_SOURCE_NAMES = {1: "SYS", 2: "TRNG", 3: "AUDIO", 4: "VIDEO", 5: "MOUSE_MOV", 6: "MOUSE_CLK"}
+
 class AyatokiIngestHandler(BaseHTTPRequestHandler):
     """Handles POST requests from Mitsu (ChaosMagnet)"""
     worker: CIPHERTANWorker = None  # Class-level reference set at startup
@@ -1533,25 +2119,36 @@ class AyatokiIngestHandler(BaseHTTPRequestHandler):
         return # Suppress standard HTTP logging to console
 
     def do_POST(self):
-        if self.path != "/ingest":
+        if self.path not in ("/ingest", "/ingest_batch", "/ingest_bin"):
             self.send_response(404)
             self.end_headers()
             return
 
         try:
             length = int(self.headers.get("Content-Length", "0"))
-            body = self.rfile.read(length)
-            
-            packet = json.loads(body.decode("utf-8"))
-            payload_hex = packet.get("payload_hex")
-            
-            if not payload_hex:
-                raise ValueError("Missing payload_hex")
+            body = self._read_body(length)
 
-            payload = bytes.fromhex(payload_hex)
+            # Mitsu's binary uplink: one or more concatenated frames
+            if self.path == "/ingest_bin":
+                self._ingest_frames(body)
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(b"OK")
+                return
+            
+            packet = _json_loads(body)
 
+            # Mitsu coalesces its backlog into a JSON array on /ingest_batch
+            if self.path == "/ingest_batch":
+                if not isinstance(packet, list):
+                    raise ValueError("Batch body must be a JSON array")
+                # Decode every item before ingesting any (same all-or-nothing as /ingest_bin)
+                decoded = [self._decode_packet(item) for item in packet]
+            else:
+                decoded = [self._decode_packet(packet)]
             if self.worker is not None:
-                self.worker.add_remote_entropy(payload, packet)
+                for payload, meta in decoded:
+                    self.worker.add_remote_entropy(payload, meta)
 
             self.send_response(200)
             self.end_headers()
@@ -1564,14 +2161,89 @@ class AyatokiIngestHandler(BaseHTTPRequestHandler):
             self.end_headers()
             self.wfile.write(b"ERR")
 
+    def _read_body(self, length: int):
+        """
+        Request body as a memoryview over a per-thread buffer reused across
+        requests. Only valid until this thread's next request: parsed values
+        and payloads must be copied out (they are).
+        """
+        if length > INGEST_BUFFER_MAX:
+            return self.rfile.read(length)
+        buf = getattr(_ingest_tls, "buf", None)
+        if buf is None or len(buf) < length:
+            buf = _ingest_tls.buf = bytearray(max(length, INGEST_BUFFER_MIN))
+        view = memoryview(buf)
+        got = 0
+        while got < length:
+            n = self.rfile.readinto(view[got:length])
+            if not n:
+                break
+            got += n
+        return view[:got]
+
+    def _ingest_frames(self, body: bytes):
+        # Parse and validate the whole body first: a bad trailing frame must
+        # not leave earlier frames ingested (Mitsu retries on 400)
+        header = MITSU_FRAME_HEADER
+        view = memoryview(body)
+        frames = []
+        offset = 0
+        while offset < len(view):
+            if offset + header.size > len(view):
+                raise ValueError("Truncated Mitsu frame")
+            frame_len, seq, ts_epoch, entropy_estimate, source_id, payload_len = \
+                header.unpack_from(view, offset)
+            start = offset + header.size
+            if frame_len + 4 < header.size + payload_len or offset + 4 + frame_len > len(view):
+                raise ValueError("Truncated Mitsu frame")
+
+            payload = bytes(view[start:start + payload_len])
+            meta = {
+                "seq": seq,
+                "ts_epoch": ts_epoch,
+                "entropy_estimate": entropy_estimate,
+                "source": MITSU_SOURCE_NAMES.get(source_id, "REMOTE"),
+            }
+            frames.append((payload, meta))
+            offset += 4 + frame_len
+        
+        if self.worker is not None:
+            for payload, meta in frames:
+                self.worker.add_remote_entropy(payload, meta)
+
+    def _decode_packet(self, packet: dict):
+        payload_hex = packet.get("payload_hex")
+        
+        if not payload_hex:
+            raise ValueError("Missing payload_hex")
+
+        return binascii.a2b_hex(payload_hex), packet
+
+INGEST_POOL_WORKERS = 8
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer that serves requests on a bounded pool, not a thread each"""
+    daemon_threads = True
+    
+    def __init__(self, *args, max_workers=INGEST_POOL_WORKERS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ayatoki-ingest")
+    
+    def process_request(self, request, client_address):
+        self._pool.submit(self.process_request_thread, request, client_address)
+    
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
 def start_ayatoki_ingest_server(worker: CIPHERTANWorker, host="0.0.0.0", port=8000):
     """Starts the HTTP server in a daemon thread"""
     def _run():
         AyatokiIngestHandler.worker = worker
         try:
-            server = HTTPServer((host, port), AyatokiIngestHandler)
+            server = PooledHTTPServer((host, port), AyatokiIngestHandler)
             worker.status_update.emit(
-                f"Ayatoki: HTTP ingest server listening on {host}:{port} (/ingest)"
+                f"Ayatoki: HTTP ingest server listening on {host}:{port} (/ingest, /ingest_batch, /ingest_bin)"
             )
             server.serve_forever()
         except Exception as e:
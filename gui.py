@@ -25,7 +25,7 @@ from serial.tools import list_ports
 from function import (
     CIPHER_COLORS, DEFAULT_DIR, KEYS_DIR, LOGS_DIR, AUDIT_DIR, DEFAULT_LOG,
     PQC_AVAILABLE, MLKEM_AVAILABLE,
-    _cc_get_icon, _cc_get_pixmap,
+    _cc_get_icon, _cc_get_pixmap, _wait_audit_file,
     EntropyVisualization, NetworkManager, EchoWorker, CIPHERTANWorker,
     start_ayatoki_ingest_server # Phase 3 Import
 )
@@ -1746,6 +1746,7 @@ class CIPHERTANMainWindow(QMainWindow):
         try:
             import json
             audit_file = AUDIT_DIR / f"{key_id}_audit.json"
+            _wait_audit_file(audit_file)  # the worker's write may still be queued
             
             if audit_file.exists():
                 with open(audit_file, 'r') as f:
@@ -1793,7 +1794,7 @@ class CIPHERTANMainWindow(QMainWindow):
         else:
             # Cleanup
             if self.worker:
-                self.worker.stop_system()
+                self.worker.shutdown()
             if self.echo_worker:
                 self.echo_worker.stop_system()
             if self.worker_thread: